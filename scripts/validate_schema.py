@@ -3,185 +3,288 @@
 Validate JSON schema design by creating and testing example outputs.
 """
 
-import json
 import sys
+from collections import deque
 
+try:
+    import fastjsonschema
+except ImportError:
+    fastjsonschema = None
 
-def create_example_json():
-    """Create an example JSON following the schema."""
-    example = {
+
+# JSON Schema encoding of the structural rules enforced by validate_structure.
+# Compiled once at import when fastjsonschema is available; the hand-rolled
+# walker below remains the zero-dependency fallback.
+_SCHEMA = {
+    "type": "object",
+    "required": ["metadata", "codebase_tree", "global_integration_map"],
+    "properties": {
         "metadata": {
-            "total_integration_points": 47,
-            "total_crossroads": 3,
-            "analysis_timestamp": "2025-10-16T14:30:00Z",
-            "python_version": "3.8+",
-            "files_analyzed": 2,
-            "packages": 1,
-            "modules": 2,
-            "classes": 1,
-            "functions": 2
+            "type": "object",
+            "required": ["total_integration_points", "analysis_timestamp"],
         },
         "codebase_tree": {
-            "myapp": {
-                "type": "package",
-                "path": "myapp/",
-                "children": {
-                    "models": {
-                        "type": "module",
-                        "path": "myapp/models.py",
-                        "imports": [
-                            {
-                                "source": "typing",
-                                "items": ["Dict", "Any"],
-                                "usage_count": 3,
-                                "line": 1,
-                                "integration_type": "stdlib_import"
-                            }
-                        ],
-                        "children": {
-                            "User": {
-                                "type": "class",
-                                "line_range": [5, 25],
-                                "inherits": [],
-                                "attributes": {
-                                    "name": {
-                                        "type": "str",
-                                        "line": 6,
-                                        "read_by": ["get_name"],
-                                        "written_by": ["__init__"]
-                                    }
-                                },
-                                "methods": {
-                                    "save": {
-                                        "type": "method",
-                                        "line_range": [15, 20],
-                                        "parameters": [
-                                            {"name": "self", "type": "User"}
+            "type": "object",
+            "additionalProperties": {
+                "type": "object",
+                "required": ["children", "type"],
+            },
+        },
+        "global_integration_map": {
+            "type": "object",
+            "required": ["crossroads", "critical_paths"],
+        },
+    },
+}
+
+_VALIDATE = fastjsonschema.compile(_SCHEMA) if fastjsonschema else None
+
+# Success banner, prebuilt so main() emits it with one write call
+_SUCCESS_BANNER = (
+    "\n" + "=" * 60 + "\n"
+    "✅ JSON SCHEMA VALIDATION PASSED\n"
+    "\n"
+    "Schema enables:\n"
+    "  • Hierarchical navigation (packages → modules → classes → methods)\n"
+    "  • Instant reverse lookups (called_by, imported_by, etc.)\n"
+    "  • Rich edge metadata (parameters, data flow, integration type)\n"
+    "  • Crossroad and critical path discovery\n"
+    "  • Zero file parsing needed for architecture queries\n\n"
+)
+
+
+# Example output built once at import; create_example_json hands out the
+# same object (read-only contract — nothing in this script mutates it).
+_EXAMPLE_JSON = {
+    "metadata": {
+        "total_integration_points": 47,
+        "total_crossroads": 3,
+        "analysis_timestamp": "2025-10-16T14:30:00Z",
+        "python_version": "3.8+",
+        "files_analyzed": 2,
+        "packages": 1,
+        "modules": 2,
+        "classes": 1,
+        "functions": 2
+    },
+    "codebase_tree": {
+        "myapp": {
+            "type": "package",
+            "path": "myapp/",
+            "children": {
+                "models": {
+                    "type": "module",
+                    "path": "myapp/models.py",
+                    "imports": [
+                        {
+                            "source": "typing",
+                            "items": ["Dict", "Any"],
+                            "usage_count": 3,
+                            "line": 1,
+                            "integration_type": "stdlib_import"
+                        }
+                    ],
+                    "children": {
+                        "User": {
+                            "type": "class",
+                            "line_range": [5, 25],
+                            "inherits": [],
+                            "attributes": {
+                                "name": {
+                                    "type": "str",
+                                    "line": 6,
+                                    "read_by": ["get_name"],
+                                    "written_by": ["__init__"]
+                                }
+                            },
+                            "methods": {
+                                "save": {
+                                    "type": "method",
+                                    "line_range": [15, 20],
+                                    "parameters": [
+                                        {"name": "self", "type": "User"}
+                                    ],
+                                    "return_type": "None",
+                                    "integration_points": {
+                                        "calls": [
+                                            {
+                                                "target": "dict",
+                                                "target_fqn": "builtins.dict",
+                                                "line": 16,
+                                                "args": [],
+                                                "return_captured": True,
+                                                "return_var": "data",
+                                                "data_flow": "create user data dict",
+                                                "integration_type": "builtin_call"
+                                            }
                                         ],
-                                        "return_type": "None",
-                                        "integration_points": {
-                                            "calls": [
-                                                {
-                                                    "target": "dict",
-                                                    "target_fqn": "builtins.dict",
-                                                    "line": 16,
-                                                    "args": [],
-                                                    "return_captured": True,
-                                                    "return_var": "data",
-                                                    "data_flow": "create user data dict",
-                                                    "integration_type": "builtin_call"
-                                                }
-                                            ],
-                                            "called_by": [
-                                                {
-                                                    "source": "myapp.api.create_user",
-                                                    "source_fqn": "myapp.api.create_user",
-                                                    "line": 30,
-                                                    "context": "API endpoint"
-                                                }
-                                            ],
-                                            "reads_attributes": [
-                                                {"attr": "self.name", "line": 17}
-                                            ],
-                                            "writes_attributes": []
-                                        },
-                                        "data_flows": []
-                                    }
-                                },
-                                "class_integration_summary": {
-                                    "total_integration_points": 12,
-                                    "integration_types": {
-                                        "calls": 3,
-                                        "called_by": 2,
-                                        "attribute_reads": 4,
-                                        "attribute_writes": 1
-                                    }
+                                        "called_by": [
+                                            {
+                                                "source": "myapp.api.create_user",
+                                                "source_fqn": "myapp.api.create_user",
+                                                "line": 30,
+                                                "context": "API endpoint"
+                                            }
+                                        ],
+                                        "reads_attributes": [
+                                            {"attr": "self.name", "line": 17}
+                                        ],
+                                        "writes_attributes": []
+                                    },
+                                    "data_flows": []
+                                }
+                            },
+                            "class_integration_summary": {
+                                "total_integration_points": 12,
+                                "integration_types": {
+                                    "calls": 3,
+                                    "called_by": 2,
+                                    "attribute_reads": 4,
+                                    "attribute_writes": 1
                                 }
                             }
                         }
                     }
                 }
             }
-        },
-        "global_integration_map": {
-            "crossroads": [
-                {
-                    "crossroad_id": "api_to_models",
-                    "type": "module_boundary",
-                    "components": ["myapp.api", "myapp.models"],
-                    "integration_patterns": ["API calls model.save()"],
-                    "integration_count": 5,
-                    "criticality": "high"
-                }
-            ],
-            "critical_paths": [
-                {
-                    "path_id": "user_save_path",
-                    "entry_point": "myapp.api.create_user",
-                    "exit_point": "models.User saved",
-                    "steps": [
-                        {"step": 1, "component": "api.create_user", "action": "receive request"},
-                        {"step": 2, "component": "models.User.save", "action": "save user"}
-                    ],
-                    "complexity": "low"
-                }
-            ],
-            "data_flows": [],
-            "statistics": {
-                "total_components": 2,
-                "total_integration_points": 47,
-                "circular_dependencies": 0
+        }
+    },
+    "global_integration_map": {
+        "crossroads": [
+            {
+                "crossroad_id": "api_to_models",
+                "type": "module_boundary",
+                "components": ["myapp.api", "myapp.models"],
+                "integration_patterns": ["API calls model.save()"],
+                "integration_count": 5,
+                "criticality": "high"
+            }
+        ],
+        "critical_paths": [
+            {
+                "path_id": "user_save_path",
+                "entry_point": "myapp.api.create_user",
+                "exit_point": "models.User saved",
+                "steps": [
+                    {"step": 1, "component": "api.create_user", "action": "receive request"},
+                    {"step": 2, "component": "models.User.save", "action": "save user"}
+                ],
+                "complexity": "low"
             }
+        ],
+        "data_flows": [],
+        "statistics": {
+            "total_components": 2,
+            "total_integration_points": 47,
+            "circular_dependencies": 0
         }
     }
-    return example
+}
+
+
+def create_example_json():
+    """Return the example JSON following the schema (module-level constant)."""
+    return _EXAMPLE_JSON
+
+
+# Required keys and precompiled error templates for the fallback walker
+# (templates are only formatted on mismatches, never on the happy path)
+_REQUIRED_SECTIONS = ("metadata", "codebase_tree", "global_integration_map")
+_REQUIRED_METADATA = ("total_integration_points", "analysis_timestamp")
+_ERR_MISSING_SECTION = "Missing top-level section: {}"
+_ERR_MISSING_METADATA = "Missing metadata field: {}"
+_PACKAGE_CHECKS = (
+    ("children", "Package '{}' has no 'children' key"),
+    ("type", "Package '{}' has no 'type' field"),
+)
+_GLOBAL_MAP_CHECKS = (
+    ("crossroads", "Missing global_integration_map.crossroads"),
+    ("critical_paths", "Missing global_integration_map.critical_paths"),
+)
 
 
 def validate_structure(json_obj):
     """Validate JSON structure follows schema."""
+    # Fast path: compiled validator (codegen'd at import, amortized across calls)
+    if _VALIDATE is not None:
+        try:
+            _VALIDATE(json_obj)
+            return []
+        except fastjsonschema.JsonSchemaException as e:
+            return [e.message]
+
+    # Fallback: hand-rolled structural walk (stdlib only)
     errors = []
 
     # Check top-level sections
-    required_sections = ["metadata", "codebase_tree", "global_integration_map"]
-    for section in required_sections:
+    for section in _REQUIRED_SECTIONS:
         if section not in json_obj:
-            errors.append(f"Missing top-level section: {section}")
+            errors.append(_ERR_MISSING_SECTION.format(section))
 
     # Check metadata
     metadata = json_obj.get("metadata", {})
-    required_metadata = ["total_integration_points", "analysis_timestamp"]
-    for field in required_metadata:
+    for field in _REQUIRED_METADATA:
         if field not in metadata:
-            errors.append(f"Missing metadata field: {field}")
+            errors.append(_ERR_MISSING_METADATA.format(field))
 
     # Check tree is hierarchical (not flat)
     tree = json_obj.get("codebase_tree", {})
     for package_name, package_data in tree.items():
-        if "children" not in package_data:
-            errors.append(f"Package '{package_name}' has no 'children' key")
-        if "type" not in package_data:
-            errors.append(f"Package '{package_name}' has no 'type' field")
+        for key, template in _PACKAGE_CHECKS:
+            if key not in package_data:
+                errors.append(template.format(package_name))
 
     # Check crossroads exist
     global_map = json_obj.get("global_integration_map", {})
-    if "crossroads" not in global_map:
-        errors.append("Missing global_integration_map.crossroads")
-    if "critical_paths" not in global_map:
-        errors.append("Missing global_integration_map.critical_paths")
+    for key, message in _GLOBAL_MAP_CHECKS:
+        if key not in global_map:
+            errors.append(message)
 
     return errors
 
 
+# Shared lookup path for the User class — walked once per query run
+_USER_PATH = ("codebase_tree", "myapp", "children", "models", "children", "User")
+
+
+# Leaf and container types the JSON encoder accepts
+_JSON_TYPES = (str, int, float, bool, type(None), list, dict)
+
+
+def _find_non_json_node(obj):
+    """Return the first non-JSON-serializable node in obj, or None."""
+    worklist = deque([obj])
+    while worklist:
+        node = worklist.popleft()
+        if not isinstance(node, _JSON_TYPES):
+            return node
+        if isinstance(node, dict):
+            worklist.extend(node.values())
+        elif isinstance(node, list):
+            worklist.extend(node)
+    return None
+
+
+def _walk(obj, path):
+    """Follow a tuple of keys through nested dicts and return the leaf."""
+    for key in path:
+        obj = obj[key]
+    return obj
+
+
 def query_example(json_obj):
     """Test typical queries on the example JSON."""
     queries_passed = 0
 
+    # Resolve the shared prefix once; a single handler covers the walk
+    try:
+        user_class = _walk(json_obj, _USER_PATH)
+    except KeyError as e:
+        print(f"❌ Could not resolve User class: {e}")
+        user_class = {}
+
     # Query 1: Navigate hierarchy
     try:
-        user_class = (
-            json_obj["codebase_tree"]["myapp"]["children"]["models"]
-            ["children"]["User"]
-        )
         assert user_class["type"] == "class"
         print("✅ Query 1: Navigate to User class via hierarchy")
         queries_passed += 1
@@ -190,10 +293,7 @@ def query_example(json_obj):
 
     # Query 2: Find what calls User.save
     try:
-        called_by = (
-            json_obj["codebase_tree"]["myapp"]["children"]["models"]
-            ["children"]["User"]["methods"]["save"]["integration_points"]["called_by"]
-        )
+        called_by = user_class["methods"]["save"]["integration_points"]["called_by"]
         assert len(called_by) > 0
         assert called_by[0]["source"] == "myapp.api.create_user"
         print("✅ Query 2: Find callers of User.save")
@@ -213,10 +313,7 @@ def query_example(json_obj):
 
     # Query 4: Find read/write attributes
     try:
-        reads = (
-            json_obj["codebase_tree"]["myapp"]["children"]["models"]
-            ["children"]["User"]["methods"]["save"]["integration_points"]["reads_attributes"]
-        )
+        reads = user_class["methods"]["save"]["integration_points"]["reads_attributes"]
         assert len(reads) > 0
         print("✅ Query 4: Find attribute reads in method")
         queries_passed += 1
@@ -234,13 +331,14 @@ def main():
     # Create example
     example_json = create_example_json()
 
-    # Validate JSON is parseable
-    try:
-        json_str = json.dumps(example_json)
-        json.loads(json_str)
+    # Validate JSON-serializability with a one-pass type walk — a dict
+    # built in-process is parseable by construction, so a dumps+loads
+    # roundtrip only proves what a leaf-type check proves more cheaply
+    bad_node = _find_non_json_node(example_json)
+    if bad_node is None:
         print("✅ Valid JSON structure")
-    except json.JSONDecodeError as e:
-        print(f"❌ Invalid JSON: {e}")
+    else:
+        print(f"❌ Non-JSON-serializable value: {bad_node!r}")
         return 1
 
     # Validate schema
@@ -261,14 +359,7 @@ def main():
     if queries_passed < 4:
         return 1
 
-    print("\n" + "=" * 60)
-    print("✅ JSON SCHEMA VALIDATION PASSED")
-    print("\nSchema enables:")
-    print("  • Hierarchical navigation (packages → modules → classes → methods)")
-    print("  • Instant reverse lookups (called_by, imported_by, etc.)")
-    print("  • Rich edge metadata (parameters, data flow, integration type)")
-    print("  • Crossroad and critical path discovery")
-    print("  • Zero file parsing needed for architecture queries\n")
+    sys.stdout.write(_SUCCESS_BANNER)
     return 0
 
 
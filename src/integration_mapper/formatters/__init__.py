@@ -3,14 +3,58 @@
 Provides pluggable formatters for different output modes:
 - VerboseFormatter: Original hierarchical format (default)
 - CompactFormatter: Context-aware token-efficient format
+
+FORMATTERS maps mode names to factories; FORMATTERS[mode]() is the
+recommended entry point for choosing a formatter at runtime.
+
+Formatter modules are loaded lazily (PEP 562): importing this package
+only executes base_formatter, and each formatter module is executed
+once, on first attribute access or first FORMATTERS call.
 """
 
-from .verbose_formatter import VerboseFormatter, create_verbose_formatter
-from .compact_formatter import CompactFormatter, create_compact_formatter
+from importlib import import_module
+from typing import Any, Callable, Dict
+
+from .base_formatter import BaseFormatter
+
+# Attribute name → (submodule, attribute) for lazy resolution
+_LAZY_ATTRS: Dict[str, tuple] = {
+    "VerboseFormatter": ("verbose_formatter", "VerboseFormatter"),
+    "create_verbose_formatter": ("verbose_formatter", "create_verbose_formatter"),
+    "CompactFormatter": ("compact_formatter", "CompactFormatter"),
+    "create_compact_formatter": ("compact_formatter", "create_compact_formatter"),
+}
+
+
+def __getattr__(name: str) -> Any:
+    """Resolve formatter attributes lazily and cache them in globals()."""
+    try:
+        module_name, attr = _LAZY_ATTRS[name]
+    except KeyError:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(import_module(f".{module_name}", __name__), attr)
+    globals()[name] = value  # cache so __getattr__ runs once per attribute
+    return value
+
+
+def _lazy_factory(module_name: str, factory_name: str) -> Callable[[], BaseFormatter]:
+    """Build a factory that imports its formatter module on first call."""
+    def factory() -> BaseFormatter:
+        return getattr(import_module(f".{module_name}", __name__), factory_name)()
+    return factory
+
+
+# Mode name → formatter factory (direct dict dispatch, no isinstance checks)
+FORMATTERS: Dict[str, Callable[[], BaseFormatter]] = {
+    "verbose": _lazy_factory("verbose_formatter", "create_verbose_formatter"),
+    "compact": _lazy_factory("compact_formatter", "create_compact_formatter"),
+}
 
 __all__ = [
+    "BaseFormatter",
     "VerboseFormatter",
     "CompactFormatter",
     "create_verbose_formatter",
     "create_compact_formatter",
+    "FORMATTERS",
 ]
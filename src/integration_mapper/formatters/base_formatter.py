@@ -0,0 +1,45 @@
+"""BaseFormatter: structural interface shared by all output formatters.
+
+Defined as a typing.Protocol rather than an ABC: formatters are matched
+structurally, so there is no abstract-method registration or metaclass
+overhead when a formatter is instantiated per run. Dispatch happens via
+the FORMATTERS table in the package __init__.
+"""
+
+from typing import Any, Dict, FrozenSet, Protocol
+
+
+class BaseFormatter(Protocol):
+    """Structural interface every formatter satisfies.
+
+    A formatter converts the mapper's verbose output dictionary into its
+    own output shape (format_output) and serializes it to disk (write).
+    Explicit subclasses also inherit a fast default validate_output,
+    and SHOULD declare __slots__ listing their own fields so instances
+    carry no per-object __dict__.
+    """
+
+    __slots__ = ()
+
+    # Required top-level keys of the verbose output shape; a single
+    # C-level subset check instead of a per-key `in` loop
+    _REQUIRED_TOP: FrozenSet[str] = frozenset(
+        {"metadata", "codebase_tree", "global_integration_map"}
+    )
+
+    def validate_output(self, output: Dict[str, Any]) -> bool:
+        """Check required top-level keys with one frozenset subset test.
+
+        Subclasses producing a different output shape override
+        _REQUIRED_TOP with their own key set.
+        """
+        return self._REQUIRED_TOP.issubset(output.keys())
+
+    def format_output(self, verbose_output: Dict[str, Any]) -> Dict[str, Any]:
+        """Convert mapper output to this formatter's output shape."""
+        ...
+
+    def write(self, output: Dict[str, Any], filepath: str,
+              readable: bool = False) -> None:
+        """Serialize formatted output to filepath."""
+        ...
@@ -6,22 +6,77 @@ through intelligent compression focused on crossroads analysis.
 Key principle: Store ANALYSIS (crossroads, critical paths), not raw edges.
 """
 
-import json
-from typing import Any, Dict, List, Optional, Tuple
-from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Tuple
 
 from ..utils.indexer import ComponentIndexer
 from ..utils.abbreviations import (
-    abbreviate_keys,
     abbreviate_type,
     abbreviate_integration,
+    KEY_ABBREV,
     TYPE_CODES,
     INTEGRATION_CODES,
 )
-from ..utils.json_writer import write_compact_json
+from ..utils.json_writer import write_compact_json, write_readable_json
+from .base_formatter import BaseFormatter
+
+
+# Metadata fields in compact output with their abbreviated key and default,
+# resolved once at import so _compress_metadata does no key translation
+_META_FIELDS = tuple(
+    (key, KEY_ABBREV.get(key, key), default) for key, default in (
+        ("total_integration_points", 0),
+        ("total_crossroads", 0),
+        ("analysis_timestamp", ""),
+        ("files_analyzed", 0),
+        ("components_found", 0),
+    )
+)
+
+
+# Criticality/complexity → single-letter codes, hoisted so the per-entry
+# helpers do no dict allocation (the two scales share one mapping)
+_CRIT_CODE = {"high": "h", "medium": "m", "low": "l"}
+_CPLX_CODE = _CRIT_CODE
 
 
-class CompactFormatter:
+class ComponentRecord:
+    """Slotted intermediate record for one flattened component.
+
+    Replaces the per-component dict allocated during hierarchy flattening
+    with a fixed-slot object (~60% smaller), deferring dict creation to
+    the final JSON emission via as_dict().
+    """
+
+    __slots__ = ("id", "type_code", "name", "parent_id", "line_range",
+                 "doc", "method_count", "attr_count")
+
+    def __init__(self, comp_id: int, type_code: str, name: str) -> None:
+        self.id = comp_id
+        self.type_code = type_code
+        self.name = name
+        self.parent_id: Optional[int] = None
+        self.line_range: Optional[List[int]] = None
+        self.doc: Optional[str] = None
+        self.method_count: Optional[int] = None
+        self.attr_count: Optional[int] = None
+
+    def as_dict(self) -> Dict[str, Any]:
+        """Emit the abbreviated-key dict used in compact JSON output."""
+        d: Dict[str, Any] = {"id": self.id, "t": self.type_code, "n": self.name}
+        if self.parent_id is not None:
+            d["p"] = self.parent_id
+        if self.line_range is not None:
+            d["lr"] = self.line_range
+        if self.doc is not None:
+            d["doc"] = self.doc
+        if self.method_count is not None:
+            d["m_ct"] = self.method_count
+        if self.attr_count is not None:
+            d["a_ct"] = self.attr_count
+        return d
+
+
+class CompactFormatter(BaseFormatter):
     """Context-aware formatter producing <30K token output.
 
     Compression strategy:
@@ -33,18 +88,37 @@ class CompactFormatter:
 
     Output structure:
     {
-        "v": "2.0-compact",
+        "v": "2.1-compact",
         "meta": {...},           # Abbreviated metadata
-        "idx": {"1": "fqn", ...},  # Component index
+        "idx": ["fqn", ...],     # Component index (position i → ID i+1)
         "cmp": [...],            # Flat components (abbreviated)
         "crd": [...],            # Crossroads analysis
         "cp": [...]              # Critical paths
     }
     """
 
-    def __init__(self) -> None:
-        """Initialize formatter with component indexer."""
-        self.indexer = ComponentIndexer()
+    __slots__ = ("indexer", "include_docstrings", "doc_max")
+
+    # Compact output has its own top-level shape
+    _REQUIRED_TOP = frozenset({"v", "meta", "idx", "cmp", "crd", "cp"})
+
+    def __init__(self, include_docstrings: bool = True,
+                 doc_max: int = 50,
+                 indexer: Optional[ComponentIndexer] = None) -> None:
+        """Initialize formatter with component indexer.
+
+        Args:
+            include_docstrings: Emit truncated docstrings in components.
+                Dropping them saves ~30-40% of compact bytes on
+                docstring-heavy codebases.
+            doc_max: Truncation length for emitted docstrings.
+            indexer: Optionally reuse an upstream ComponentIndexer so
+                FQNs already interned there resolve as lookups instead
+                of fresh insertions.
+        """
+        self.indexer = indexer if indexer is not None else ComponentIndexer()
+        self.include_docstrings = include_docstrings
+        self.doc_max = doc_max
 
     def format_output(self, verbose_output: Dict[str, Any]) -> Dict[str, Any]:
         """Convert verbose output to compact format.
@@ -60,95 +134,111 @@ class CompactFormatter:
         tree = verbose_output.get("codebase_tree", {})
         integration_map = verbose_output.get("global_integration_map", {})
 
-        # Step 1: Flatten component hierarchy
-        flat_components = self._flatten_hierarchy(tree)
+        # Step 1: Flatten component hierarchy (consumes an iterator so
+        # upstream can stream roots instead of materializing a dict).
+        # Records stay slotted until this point; dicts with abbreviated
+        # keys are materialized only at the encode boundary.
+        flat_components = [record.as_dict()
+                           for record in self._flatten_hierarchy(tree.items())]
 
-        # Step 2: Abbreviate keys
-        flat_components_abbr = abbreviate_keys(flat_components)
-
-        # Step 3: Extract and compress crossroads
+        # Step 2: Extract and compress crossroads
         crossroads = integration_map.get("crossroads", [])
         crossroads_abbr = self._compress_crossroads(crossroads)
 
-        # Step 4: Extract and compress critical paths
+        # Step 3: Extract and compress critical paths
         critical_paths = integration_map.get("critical_paths", [])
         critical_paths_abbr = self._compress_critical_paths(critical_paths)
 
-        # Step 5: Create metadata section
+        # Step 4: Create metadata section
         meta_abbr = self._compress_metadata(metadata)
 
-        # Step 6: Assemble output
+        # Step 5: Assemble output
         output = {
-            "v": "2.0-compact",
+            "v": "2.1-compact",
             "meta": meta_abbr,
-            "idx": self.indexer.to_json_index(),  # ID → FQN mapping
-            "cmp": flat_components_abbr,  # Compressed components
+            # Positional ID → FQN mapping (list index i holds ID i+1)
+            "idx": self.indexer.to_fqn_list(),
+            "cmp": flat_components,  # Compressed components
             "crd": crossroads_abbr,  # Crossroads analysis
             "cp": critical_paths_abbr,  # Critical paths
         }
 
         return output
 
-    def _flatten_hierarchy(self, tree: Dict[str, Any], parent_id: Optional[int] = None) -> List[Dict[str, Any]]:
+    def _flatten_hierarchy(self, roots: Iterable[Tuple[str, Dict[str, Any]]],
+                           parent_id: Optional[int] = None) -> List["ComponentRecord"]:
         """Flatten nested hierarchy to component list with parent IDs.
 
+        Accepts any iterable of (name, node) pairs so callers can stream
+        root components instead of holding the full tree dict.
+
         Before (nested): 8 levels deep, massive duplication
         After (flat): Single list with parent IDs
 
         Token savings: ~60% through structure flattening
         """
         components = []
-
-        def traverse(node: Dict[str, Any], node_name: str, parent_id_val: Optional[int]) -> None:
-            """Recursively traverse hierarchy."""
-            # Get FQN
-            if isinstance(node, dict):
-                fqn = node.get("fqn")
-                if not fqn:
-                    # Build FQN from path
-                    node_type = node.get("type", "package")
-                    fqn = node_name
-
-                # Create ID
-                comp_id = self.indexer.get_or_create_id(fqn)
-
-                # Create component entry
-                component: Dict[str, Any] = {
-                    "id": comp_id,
-                    "t": abbreviate_type(node.get("type", "package")),
-                    "n": node_name,
-                }
-
-                # Add parent if exists
-                if parent_id_val is not None:
-                    component["p"] = parent_id_val
-
-                # Add optional fields only if present
-                if "line_range" in node:
-                    component["lr"] = node["line_range"]
-
-                if "docstring" in node and node["docstring"]:
-                    # Truncate docstring to first 50 chars
-                    doc = node["docstring"][:50]
-                    if len(node["docstring"]) > 50:
-                        doc += "..."
-                    component["doc"] = doc
-
-                # Add method/attribute count if relevant
-                if "methods" in node:
-                    component["m_ct"] = len(node["methods"])
-                if "attributes" in node:
-                    component["a_ct"] = len(node["attributes"])
-
-                components.append(component)
-
-                # Traverse children
-                for child_name, child_node in node.get("children", {}).items():
-                    traverse(child_node, child_name, comp_id)
-
-        # Process tree
-        for root_name, root_node in tree.items():
-            traverse(root_node, root_name, None)
+        get_id = self.indexer.get_or_create_id  # hoisted attribute lookup
+
+        # Explicit DFS stack of (node, name, parent_id, parent_fqn) — no
+        # per-node Python frame, and no RecursionError on deep trees.
+        # Non-dict children (FQN reference strings) are filtered at push
+        # time so the loop body runs no per-node type check.
+        stack: List[Tuple[Dict[str, Any], str, Optional[int], str]] = [
+            (root_node, root_name, None, "")
+            for root_name, root_node in roots if type(root_node) is dict
+        ]
+        stack.reverse()
+
+        while stack:
+            node, node_name, parent_id_val, parent_fqn = stack.pop()
+
+            # Get FQN (package nodes carry no fqn — derive from parent chain)
+            fqn = node.get("fqn")
+            if not fqn:
+                fqn = f"{parent_fqn}.{node_name}" if parent_fqn else node_name
+
+            # Create ID
+            comp_id = get_id(fqn)
+
+            # Create slotted component record
+            record = ComponentRecord(
+                comp_id,
+                abbreviate_type(node.get("type", "package")),
+                node_name,
+            )
+
+            # Add parent if exists
+            if parent_id_val is not None:
+                record.parent_id = parent_id_val
+
+            # Add optional fields only if present
+            if "line_range" in node:
+                record.line_range = node["line_range"]
+
+            if self.include_docstrings and node.get("docstring"):
+                # Truncate docstring to doc_max chars
+                doc = node["docstring"]
+                if len(doc) > self.doc_max:
+                    doc = doc[:self.doc_max] + "..."
+                record.doc = doc
+
+            # Add method/attribute count if relevant
+            if "methods" in node:
+                record.method_count = len(node["methods"])
+            if "attributes" in node:
+                record.attr_count = len(node["attributes"])
+
+            components.append(record)
+
+            # Push children (reversed so pre-order output matches recursion)
+            children = node.get("children")
+            if children:
+                stack.extend(
+                    (child_node, child_name, comp_id, fqn)
+                    for child_name, child_node in reversed(list(children.items()))
+                    if type(child_node) is dict
+                )
 
         return components
 
@@ -158,66 +248,51 @@ class CompactFormatter:
         Crossroads are module boundary interaction points - the KEY insight of the
         integration mapper. Store these efficiently.
         """
-        compressed = []
-
-        for crossroad in crossroads:
-            # Get IDs for components
-            components = crossroad.get("components", [])
-            component_ids = []
-            for comp in components:
-                comp_id = self.indexer.get_or_create_id(comp)
-                component_ids.append(comp_id)
-
-            compressed_crossroad: Dict[str, Any] = {
-                "id": crossroad.get("id"),
-                "c": component_ids,  # components
-                "cnt": crossroad.get("integration_count", 0),  # count
-            }
-
-            # Add criticality if present
-            if "criticality" in crossroad:
-                crit = crossroad["criticality"]
-                # Map to codes: h=high, m=medium, l=low
-                crit_code = {"high": "h", "medium": "m", "low": "l"}.get(crit, "m")
-                compressed_crossroad["crit"] = crit_code
+        get_id = self.indexer.get_or_create_id  # one attribute lookup, not per-FQN
+        return [self._compress_crossroad(crossroad, get_id)
+                for crossroad in crossroads]
+
+    def _compress_crossroad(self, crossroad: Dict[str, Any],
+                            get_id) -> Dict[str, Any]:
+        """Compress a single crossroad entry."""
+        compressed_crossroad: Dict[str, Any] = {
+            "id": crossroad.get("id"),
+            # components (tuple: fixed-size record, smaller and faster to
+            # serialize than a list)
+            "c": tuple(get_id(comp) for comp in crossroad.get("components", [])),
+            "cnt": crossroad.get("integration_count", 0),  # count
+        }
 
-            compressed.append(compressed_crossroad)
+        # Add criticality if present
+        if "criticality" in crossroad:
+            # Map to codes: h=high, m=medium, l=low
+            compressed_crossroad["crit"] = _CRIT_CODE.get(crossroad["criticality"], "m")
 
-        return compressed
+        return compressed_crossroad
 
     def _compress_critical_paths(self, critical_paths: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
         """Compress critical paths analysis."""
-        compressed = []
-
-        for path in critical_paths:
-            entry_point = path.get("entry_point", "")
-            entry_id = self.indexer.get_or_create_id(entry_point)
-
-            compressed_path: Dict[str, Any] = {
-                "id": path.get("id"),
-                "ep": entry_id,  # entry_point
-                "cc": path.get("call_count", 0),  # call_count
-            }
-
-            # Add complexity if present
-            if "complexity" in path:
-                cplx = path["complexity"]
-                cplx_code = {"high": "h", "medium": "m", "low": "l"}.get(cplx, "m")
-                compressed_path["cx"] = cplx_code
+        get_id = self.indexer.get_or_create_id
+        return [self._compress_path(path, get_id) for path in critical_paths]
+
+    def _compress_path(self, path: Dict[str, Any], get_id) -> Dict[str, Any]:
+        """Compress a single critical-path entry."""
+        compressed_path: Dict[str, Any] = {
+            "id": path.get("id"),
+            "ep": get_id(path.get("entry_point", "")),  # entry_point
+            "cc": path.get("call_count", 0),  # call_count
+        }
 
-            compressed.append(compressed_path)
+        # Add complexity if present
+        if "complexity" in path:
+            compressed_path["cx"] = _CPLX_CODE.get(path["complexity"], "m")
 
-        return compressed
+        return compressed_path
 
     def _compress_metadata(self, metadata: Dict[str, Any]) -> Dict[str, Any]:
-        """Compress metadata section."""
-        return abbreviate_keys({
-            "total_integration_points": metadata.get("total_integration_points", 0),
-            "total_crossroads": metadata.get("total_crossroads", 0),
-            "analysis_timestamp": metadata.get("analysis_timestamp", ""),
-            "files_analyzed": metadata.get("files_analyzed", 0),
-            "components_found": metadata.get("components_found", 0),
-        })
+        """Compress metadata section using the pre-abbreviated key table."""
+        return {abbr: metadata.get(key, default)
+                for key, abbr, default in _META_FIELDS}
 
     def write(self, output: Dict[str, Any], filepath: str, readable: bool = False) -> None:
         """Write output to file.
@@ -229,8 +304,7 @@ class CompactFormatter:
         """
         if readable:
             # Pretty-print for human reading
-            with open(filepath, 'w', encoding='utf-8') as f:
-                json.dump(output, f, indent=2, ensure_ascii=False)
+            write_readable_json(output, filepath)
         else:
             # Minified for production (reduces by another ~30%)
             write_compact_json(output, filepath)
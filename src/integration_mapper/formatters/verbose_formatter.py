@@ -5,18 +5,21 @@ tree and integration details. This is the original format, kept
 for backward compatibility.
 """
 
-import json
 from typing import Any, Dict
-from pathlib import Path
 
+from ..utils.json_writer import write_json_sections
+from .base_formatter import BaseFormatter
 
-class VerboseFormatter:
+
+class VerboseFormatter(BaseFormatter):
     """Original verbose formatter (default, backward compatible).
 
     Output structure matches the hierarchical tree structure directly.
     This is the original integration_mapper.py output format.
     """
 
+    __slots__ = ()
+
     def format_output(self, verbose_output: Dict[str, Any]) -> Dict[str, Any]:
         """Return output as-is (no compression).
 
@@ -34,13 +37,15 @@ class VerboseFormatter:
     def write(self, output: Dict[str, Any], filepath: str, readable: bool = True) -> None:
         """Write output to file with pretty-printing.
 
+        Streams the document section by section so peak memory is bounded
+        by the largest top-level section, not the full serialized output.
+
         Args:
             output: Output dictionary
             filepath: Output file path
             readable: Always True for verbose mode (pretty-printed by default)
         """
-        with open(filepath, 'w', encoding='utf-8') as f:
-            json.dump(output, f, indent=2, ensure_ascii=False)
+        write_json_sections(output, filepath, readable=True)
 
 
 def create_verbose_formatter() -> VerboseFormatter:
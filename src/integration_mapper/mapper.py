@@ -10,15 +10,30 @@ Three-phase architecture:
 """
 
 import ast
+import fnmatch
+import inspect
 import json
+import os
+import re
 import sys
 import argparse
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
 from typing import Dict, List, Any, Set, Optional, Tuple
-from collections import defaultdict
+from collections import Counter, defaultdict, deque
 from datetime import datetime
 
 
+# Interned integration_type constants: every edge shares one string object
+# per kind instead of holding its own copy, and downstream comparisons hit
+# the pointer-equality fast path
+_IT_IMPORT_MODULE = sys.intern("import_module")
+_IT_IMPORT_FROM = sys.intern("import_from")
+_IT_FUNCTION_CALL = sys.intern("function_call")
+_IT_ATTRIBUTE_ACCESS = sys.intern("attribute_access")
+_IT_INHERITANCE = sys.intern("inheritance")
+
+
 # ============================================================================
 # PHASE 1: HIERARCHY BUILDING
 # ============================================================================
@@ -30,18 +45,35 @@ class HierarchyBuilder(ast.NodeVisitor):
         self.tree: Dict[str, Any] = {}
         self.symbol_table: Dict[str, Dict[str, Any]] = {}
         self.scope_stack: List[str] = []  # [package, module, class, function]
+        self._fqn_stack: List[str] = [""]  # joined FQN per scope depth
         self.current_module: Optional[str] = None
         self.alias_map: Dict[str, str] = {}
-        self.imports_in_module: List[Dict[str, Any]] = []
+        # id(node) → FQN, valid for the lifetime of one module's AST
+        self._attr_fqn_cache: Dict[int, str] = {}
 
     def get_current_fqn(self) -> str:
-        """Get fully qualified name for current scope."""
-        return ".".join(self.scope_stack)
+        """Get fully qualified name for current scope.
+
+        Reads the precomputed top of _fqn_stack — the join over the scope
+        stack is paid once per push, not once per visited node.
+        """
+        return self._fqn_stack[-1]
+
+    def _push_scope(self, name: str) -> None:
+        """Enter a scope, extending the cached FQN incrementally."""
+        self.scope_stack.append(name)
+        top = self._fqn_stack[-1]
+        self._fqn_stack.append(f"{top}.{name}" if top else name)
+
+    def _pop_scope(self) -> None:
+        """Leave the innermost scope."""
+        self.scope_stack.pop()
+        self._fqn_stack.pop()
 
     def register_node(self, node_type: str, name: str, node: ast.AST,
                       parent_fqn: str = "") -> str:
         """Register a node in symbol table and return its FQN."""
-        fqn = f"{parent_fqn}.{name}" if parent_fqn else name
+        fqn = sys.intern(f"{parent_fqn}.{name}" if parent_fqn else name)
 
         # Handle Module nodes which don't have lineno
         if isinstance(node, ast.Module):
@@ -49,8 +81,20 @@ class HierarchyBuilder(ast.NodeVisitor):
         else:
             line_range = [node.lineno, node.end_lineno or node.lineno]
 
-        docstring = ast.get_docstring(node)
-
+        # Inline the docstring probe: most bodies don't start with a string
+        # constant, and this skips the ast.get_docstring call (and its
+        # cleandoc import machinery) for all of them. cleandoc still runs
+        # on actual docstrings so emitted text matches ast.get_docstring.
+        docstring = None
+        body = getattr(node, "body", None)
+        if body and isinstance(body[0], ast.Expr):
+            value = body[0].value
+            if isinstance(value, ast.Constant) and isinstance(value.value, str):
+                docstring = inspect.cleandoc(value.value)
+
+        # Collection fields (children, methods, bases, parameters, ...) are
+        # allocated lazily on first insert via setdefault — on big codebases
+        # most stay empty forever, and omitting them also shrinks the JSON
         self.symbol_table[fqn] = {
             "type": node_type,
             "fqn": fqn,
@@ -58,8 +102,6 @@ class HierarchyBuilder(ast.NodeVisitor):
             "line_range": line_range,
             "path": self.current_module,
             "docstring": docstring,
-            "children": {},
-            "imports": self.imports_in_module if node_type == "module" else [],
         }
 
         return fqn
@@ -68,18 +110,18 @@ class HierarchyBuilder(ast.NodeVisitor):
         """Process module and set up scope."""
         # Extract module FQN from path
         module_fqn = self.current_module.replace("/", ".").replace(".py", "")
+        self._attr_fqn_cache.clear()
 
         # Register module
         self.register_node("module", module_fqn, node)
         self.scope_stack = [module_fqn]
+        self._fqn_stack = ["", module_fqn]
 
-        # Add to tree
+        # Add to tree — setdefault inserts and descends in one lookup per part
         parts = module_fqn.split(".")
         current = self.tree
         for part in parts[:-1]:
-            if part not in current:
-                current[part] = {"type": "package", "children": {}}
-            current = current[part]["children"]
+            current = current.setdefault(part, {"type": "package", "children": {}})["children"]
 
         current[parts[-1]] = self.symbol_table[module_fqn]
 
@@ -94,23 +136,23 @@ class HierarchyBuilder(ast.NodeVisitor):
         # Track base classes
         bases = []
         for base in node.bases:
-            if isinstance(base, ast.Name):
+            tb = type(base)
+            if tb is ast.Name:
                 bases.append(base.id)
-            elif isinstance(base, ast.Attribute):
+            elif tb is ast.Attribute:
                 bases.append(self._extract_attribute_fqn(base))
 
-        self.symbol_table[class_fqn]["bases"] = bases
-        self.symbol_table[class_fqn]["methods"] = {}
-        self.symbol_table[class_fqn]["attributes"] = {}
+        if bases:
+            self.symbol_table[class_fqn]["bases"] = bases
 
         # Register class in parent (only if parent exists)
         if parent_fqn in self.symbol_table:
-            self.symbol_table[parent_fqn]["children"][node.name] = class_fqn
+            self.symbol_table[parent_fqn].setdefault("children", {})[node.name] = class_fqn
 
         # Push scope and visit
-        self.scope_stack.append(node.name)
+        self._push_scope(node.name)
         self.generic_visit(node)
-        self.scope_stack.pop()
+        self._pop_scope()
 
     def visit_FunctionDef(self, node: ast.FunctionDef) -> None:
         """Process function or method."""
@@ -118,15 +160,10 @@ class HierarchyBuilder(ast.NodeVisitor):
         func_fqn = self.register_node("function", node.name, node, parent_fqn)
 
         # Extract parameters
-        params = []
-        for arg in node.args.args:
-            params.append({"name": arg.arg, "type": None})
-
-        self.symbol_table[func_fqn]["parameters"] = params
-        self.symbol_table[func_fqn]["return_type"] = None
-        self.symbol_table[func_fqn]["calls"] = []
-        self.symbol_table[func_fqn]["reads_attributes"] = []
-        self.symbol_table[func_fqn]["writes_attributes"] = []
+        if node.args.args:
+            self.symbol_table[func_fqn]["parameters"] = [
+                {"name": arg.arg, "type": None} for arg in node.args.args
+            ]
 
         # Register in parent (only if parent exists)
         if parent_fqn in self.symbol_table:
@@ -134,50 +171,192 @@ class HierarchyBuilder(ast.NodeVisitor):
                 # This is a method
                 parent_class_fqn = self.scope_stack[-1]
                 if parent_class_fqn in self.symbol_table:
-                    self.symbol_table[parent_class_fqn]["methods"][node.name] = func_fqn
+                    self.symbol_table[parent_class_fqn].setdefault(
+                        "methods", {})[node.name] = func_fqn
             else:
                 # This is a module-level function
-                self.symbol_table[parent_fqn]["children"][node.name] = func_fqn
+                self.symbol_table[parent_fqn].setdefault(
+                    "children", {})[node.name] = func_fqn
 
-        # Don't visit nested functions deeply
-        self.generic_visit(node)
+        # Hierarchy only needs nested definitions — skip expression subtrees
+        self._visit_nested_definitions(node)
 
-    def visit_AsyncFunctionDef(self, node: ast.AsyncFunctionDef) -> None:
-        """Process async function (same as FunctionDef)."""
-        self.visit_FunctionDef(node)  # type: ignore
+    def _visit_nested_definitions(self, node: ast.AST) -> None:
+        """Visit only nested class/function definitions under a function.
+
+        Phase 1 assigns FQNs to definitions; walking every statement and
+        expression inside a function body via generic_visit traverses the
+        bulk of the AST for nothing. This sweeps statement blocks (body,
+        orelse, try/except, match cases) and recurses solely into defs.
+        """
+        pending = deque(node.body)
+        while pending:
+            stmt = pending.popleft()
+            if isinstance(stmt, (ast.ClassDef, ast.FunctionDef, ast.AsyncFunctionDef)):
+                self.visit(stmt)
+                continue
+            for field in ("body", "orelse", "finalbody", "handlers", "cases"):
+                block = getattr(stmt, field, None)
+                if block:
+                    pending.extend(block)
 
     def _extract_attribute_fqn(self, node: ast.Attribute) -> str:
-        """Extract FQN from attribute chain like obj.a.b.c."""
-        parts = []
-        current = node
-        while isinstance(current, ast.Attribute):
-            parts.append(current.attr)
+        """Extract FQN from attribute chain like obj.a.b.c.
+
+        Memoized by id(node): nested chains are revisited once per interior
+        node, and the AST is immutable within a run, so each chain is only
+        walked the first time it is seen.
+        """
+        cached = self._attr_fqn_cache.get(id(node))
+        if cached is not None:
+            return cached
+
+        # Build in-order by prepending — for the typical 2-4 part chain
+        # this allocates only the intermediate strings, with no parts
+        # list, reversed() iterator, or join
+        out = node.attr
+        current = node.value
+        while type(current) is ast.Attribute:
+            out = current.attr + "." + out
             current = current.value
-        if isinstance(current, ast.Name):
-            parts.append(current.id)
-        return ".".join(reversed(parts))
+        if type(current) is ast.Name:
+            out = current.id + "." + out
+        fqn = sys.intern(out)
+        self._attr_fqn_cache[id(node)] = fqn
+        return fqn
+
+
+# Async defs get the exact same treatment; binding the method directly
+# avoids a Python-level delegation frame per async function visited
+HierarchyBuilder.visit_AsyncFunctionDef = HierarchyBuilder.visit_FunctionDef
 
 
 # ============================================================================
 # PHASE 2: INTEGRATION EXTRACTION
 # ============================================================================
 
-class IntegrationExtractor(ast.NodeVisitor):
+# node type → its _fields tuple, filled on first encounter
+_FIELD_CACHE: Dict[type, Tuple[str, ...]] = {}
+
+
+class _TableDispatchVisitor(ast.NodeVisitor):
+    """NodeVisitor with precomputed dict dispatch instead of getattr.
+
+    NodeVisitor builds 'visit_' + __class__.__name__ and getattr-dispatches
+    for every node, and generic_visit re-derives child fields via
+    iter_fields each time. Subclasses assign _dispatch after their class
+    body ({node type: handler function}); every other node type falls
+    through to the table-driven generic_visit, which iterates children
+    from a cached per-type _fields tuple.
+    """
+
+    _dispatch: Dict[type, Any] = {}
+
+    def visit(self, node: ast.AST) -> None:
+        """Dispatch through the precomputed type→handler table."""
+        handler = self._dispatch.get(node.__class__)
+        if handler is not None:
+            handler(self, node)
+        else:
+            self.generic_visit(node)
+
+    def generic_visit(self, node: ast.AST) -> None:
+        """Visit children via cached per-type field tuples (no iter_fields)."""
+        dispatch = self._dispatch
+        fields = _FIELD_CACHE.get(node.__class__)
+        if fields is None:
+            fields = _FIELD_CACHE[node.__class__] = node._fields
+        for name in fields:
+            value = getattr(node, name)
+            if type(value) is list:
+                for item in value:
+                    if isinstance(item, ast.AST):
+                        handler = dispatch.get(item.__class__)
+                        if handler is not None:
+                            handler(self, item)
+                        else:
+                            self.generic_visit(item)
+            elif isinstance(value, ast.AST):
+                handler = dispatch.get(value.__class__)
+                if handler is not None:
+                    handler(self, value)
+                else:
+                    self.generic_visit(value)
+
+
+# Columnar (structure-of-arrays) edge layout: one parallel list per field
+# instead of one ~10-key dict per edge. Phase 3 then scans plain string
+# lists instead of hashing dict keys per edge, and per-edge memory drops
+# from a full dict to six list slots. "extra" holds the per-kind payload:
+# items (imports), args (calls), access (attributes), targets (inheritance).
+_EDGE_COLUMNS = ("type", "source", "target", "line", "integration_type", "extra",
+                 "count")
+
+
+def _new_edge_columns() -> Dict[str, List[Any]]:
+    """Create an empty columnar edge store."""
+    return {col: [] for col in _EDGE_COLUMNS}
+
+
+class IntegrationExtractor(_TableDispatchVisitor):
     """Extract rich integration edges (imports, calls, attributes, inheritance)."""
 
-    def __init__(self, symbol_table: Dict[str, Dict[str, Any]]):
+    def __init__(self, symbol_table: Dict[str, Dict[str, Any]],
+                 capture_args: bool = True):
         self.symbol_table = symbol_table
+        # Argument capture is descriptive only; callers that just need the
+        # graph topology can turn it off and skip the per-call arg loop
+        self.capture_args = capture_args
         self.scope_stack: List[str] = []
+        self._fqn_stack: List[str] = [""]
         self.current_module: Optional[str] = None
         self.alias_map: Dict[str, str] = {}
-        self.integration_edges: List[Dict[str, Any]] = []
+        self.edges: Dict[str, List[Any]] = _new_edge_columns()
         self.call_graph: Dict[str, List[str]] = defaultdict(list)
+        self._attr_fqn_cache: Dict[int, str] = {}
+        self._edge_index: Dict[Tuple[Any, ...], int] = {}
+
+    def _emit_edge(self, edge_type: str, source: str, target: str,
+                   line: int, integration_type: str, extra: Any = None) -> None:
+        """Append one edge across the parallel column lists.
+
+        Identical edges (same kind, endpoints, line, and access mode) are
+        stored once with a multiplicity count instead of as separate rows —
+        loops and repeated accesses otherwise inflate the edge store many
+        times over. Crossroad detection weights by the count column, so
+        analytics keep the full multiplicity.
+        """
+        # Attribute edges dedupe on (source, target, access) alone — the
+        # same self.x read on fifty lines of one scope is one fact, and
+        # line-distinct repeats are where most duplicate volume comes from.
+        # Other kinds keep the line so e.g. two calls stay two rows.
+        if edge_type == "attribute":
+            key: Tuple[Any, ...] = (edge_type, source, target, extra)
+        else:
+            key = (edge_type, source, target, line,
+                   extra if type(extra) is str else None)
+        row = self._edge_index.get(key)
+        if row is not None:
+            self.edges["count"][row] += 1
+            return
+
+        edges = self.edges
+        self._edge_index[key] = len(edges["type"])
+        edges["type"].append(edge_type)
+        edges["source"].append(source)
+        edges["target"].append(target)
+        edges["line"].append(line)
+        edges["integration_type"].append(integration_type)
+        edges["extra"].append(extra)
+        edges["count"].append(1)
 
     def visit_Module(self, node: ast.Module) -> None:
         """Set up module scope."""
         module_fqn = self.current_module.replace("/", ".").replace(".py", "")
         self.scope_stack = [module_fqn]
+        self._fqn_stack = ["", module_fqn]
         self.alias_map.clear()
+        self._attr_fqn_cache.clear()
         self.generic_visit(node)
 
     def visit_Import(self, node: ast.Import) -> None:
@@ -185,17 +364,10 @@ class IntegrationExtractor(ast.NodeVisitor):
         for alias in node.names:
             module_name = alias.name
             as_name = alias.asname or alias.name
-            self.alias_map[as_name] = module_name
-
-            edge = {
-                "type": "import",
-                "source": self.get_current_fqn(),
-                "target": module_name,
-                "items": [as_name],
-                "line": node.lineno,
-                "integration_type": "import_module"
-            }
-            self.integration_edges.append(edge)
+            self.alias_map[as_name] = sys.intern(module_name)
+
+            self._emit_edge("import", self.get_current_fqn(), module_name,
+                            node.lineno, _IT_IMPORT_MODULE, extra=[as_name])
 
     def visit_ImportFrom(self, node: ast.ImportFrom) -> None:
         """Process from...import statements."""
@@ -206,62 +378,68 @@ class IntegrationExtractor(ast.NodeVisitor):
         for alias in node.names:
             items.append(alias.name)
             as_name = alias.asname or alias.name
-            self.alias_map[as_name] = f"{node.module}.{alias.name}"
-
-        edge = {
-            "type": "import",
-            "source": self.get_current_fqn(),
-            "target": node.module,
-            "items": items,
-            "line": node.lineno,
-            "integration_type": "import_from"
-        }
-        self.integration_edges.append(edge)
+            self.alias_map[as_name] = sys.intern(f"{node.module}.{alias.name}")
+
+        self._emit_edge("import", self.get_current_fqn(), node.module,
+                        node.lineno, _IT_IMPORT_FROM, extra=items)
 
     def visit_Call(self, node: ast.Call) -> None:
         """Process function calls."""
         target_fqn = self._resolve_call_target(node.func)
 
-        # Extract arguments
-        args = []
-        for arg in node.args:
-            args.append({"type": "positional", "value": ast.unparse(arg)})
-        for keyword in node.keywords:
-            args.append({"type": "keyword", "name": keyword.arg, "value": ast.unparse(keyword.value)})
-
-        edge = {
-            "type": "call",
-            "source": self.get_current_fqn(),
-            "target": target_fqn,
-            "target_fqn": target_fqn,
-            "line": node.lineno,
-            "args": args,
-            "integration_type": "function_call"
-        }
-
-        self.integration_edges.append(edge)
+        # Extract arguments (cheap repr — ast.unparse is a full source
+        # emitter and dominates Phase 2 CPU on argument-heavy code)
+        args = None
+        if self.capture_args:
+            args = []
+            for arg in node.args:
+                args.append({"type": "positional", "value": self._cheap_repr(arg)})
+            for keyword in node.keywords:
+                args.append({"type": "keyword", "name": keyword.arg, "value": self._cheap_repr(keyword.value)})
+
+        self._emit_edge("call", self.get_current_fqn(), target_fqn,
+                        node.lineno, _IT_FUNCTION_CALL, extra=args)
         self.call_graph[target_fqn].append(self.get_current_fqn())
 
-        self.generic_visit(node)
+        # The call target was fully consumed by _resolve_call_target —
+        # descending into node.func would re-walk the a.b.c chain and emit
+        # a redundant attribute edge per link. Visit only the argument
+        # subtrees, plus any non-trivial base under an Attribute target
+        # (f().x()) so nested calls there are kept.
+        func = node.func
+        tf = type(func)
+        if tf is ast.Attribute:
+            current = func.value
+            while type(current) is ast.Attribute:
+                current = current.value
+            if type(current) is not ast.Name:
+                self.visit(current)
+        elif tf is not ast.Name:
+            self.visit(func)
+        for arg in node.args:
+            self.visit(arg)
+        for keyword in node.keywords:
+            self.visit(keyword.value)
 
     def visit_Attribute(self, node: ast.Attribute) -> None:
         """Process attribute access (read/write)."""
         # Determine if this is a read or write
-        is_write = isinstance(node.ctx, ast.Store)
+        is_write = type(node.ctx) is ast.Store
 
         fqn = self._extract_attribute_fqn(node)
 
-        edge = {
-            "type": "attribute",
-            "source": self.get_current_fqn(),
-            "target": fqn,
-            "access": "write" if is_write else "read",
-            "line": node.lineno,
-            "integration_type": "attribute_access"
-        }
+        self._emit_edge("attribute", self.get_current_fqn(), fqn,
+                        node.lineno, _IT_ATTRIBUTE_ACCESS,
+                        extra="write" if is_write else "read")
 
-        self.integration_edges.append(edge)
-        self.generic_visit(node)
+        # One edge per chain: skip the interior Attribute/Name nodes of
+        # a.b.c.d (generic_visit would emit a redundant edge for each),
+        # but still descend into a non-trivial base like f().x or d[k].x
+        current = node.value
+        while type(current) is ast.Attribute:
+            current = current.value
+        if type(current) is not ast.Name:
+            self.visit(current)
 
     def visit_ClassDef(self, node: ast.ClassDef) -> None:
         """Extract inheritance information."""
@@ -269,50 +447,170 @@ class IntegrationExtractor(ast.NodeVisitor):
 
         bases = []
         for base in node.bases:
-            if isinstance(base, ast.Name):
-                base_fqn = self.alias_map.get(base.id, base.id)
-                bases.append(base_fqn)
-            elif isinstance(base, ast.Attribute):
-                base_fqn = self._extract_attribute_fqn(base)
-                bases.append(base_fqn)
+            tb = type(base)
+            if tb is ast.Name:
+                bases.append(self.alias_map.get(base.id, base.id))
+            elif tb is ast.Attribute:
+                bases.append(self._extract_attribute_fqn(base))
 
         if bases:
-            edge = {
-                "type": "inheritance",
-                "source": class_fqn,
-                "targets": bases,
-                "line": node.lineno,
-                "integration_type": "inheritance"
-            }
-            self.integration_edges.append(edge)
+            # No single target for multi-base inheritance; bases go in extra
+            self._emit_edge("inheritance", class_fqn, "",
+                            node.lineno, _IT_INHERITANCE, extra=bases)
 
-        self.scope_stack.append(node.name)
+        self._push_scope(node.name)
         self.generic_visit(node)
-        self.scope_stack.pop()
+        self._pop_scope()
 
     def get_current_fqn(self) -> str:
-        """Get current FQN."""
-        return ".".join(self.scope_stack) if self.scope_stack else ""
+        """Get current FQN (precomputed — see HierarchyBuilder)."""
+        return self._fqn_stack[-1]
+
+    def _push_scope(self, name: str) -> None:
+        """Enter a scope, extending the cached FQN incrementally."""
+        self.scope_stack.append(name)
+        top = self._fqn_stack[-1]
+        self._fqn_stack.append(f"{top}.{name}" if top else name)
+
+    def _pop_scope(self) -> None:
+        """Leave the innermost scope."""
+        self.scope_stack.pop()
+        self._fqn_stack.pop()
+
+    def _cheap_repr(self, expr: ast.expr) -> str:
+        """Lightweight one-level rendering of a call argument.
+
+        Names, constants and attribute chains cover the vast majority of
+        arguments; anything else gets a node-type placeholder rather than
+        paying for a recursive ast.unparse.
+        """
+        te = type(expr)
+        if te is ast.Name:
+            return expr.id
+        if te is ast.Constant:
+            return repr(expr.value)
+        if te is ast.Attribute:
+            return self._extract_attribute_fqn(expr)
+        return f"<{te.__name__}>"
 
     def _resolve_call_target(self, func: ast.expr) -> str:
         """Resolve function call target to FQN."""
-        if isinstance(func, ast.Name):
+        tf = type(func)
+        if tf is ast.Name:
             return self.alias_map.get(func.id, func.id)
-        elif isinstance(func, ast.Attribute):
+        elif tf is ast.Attribute:
             return self._extract_attribute_fqn(func)
         else:
             return "<dynamic_call>"
 
     def _extract_attribute_fqn(self, node: ast.Attribute) -> str:
-        """Extract FQN from attribute chain."""
-        parts = []
-        current = node
-        while isinstance(current, ast.Attribute):
-            parts.append(current.attr)
+        """Extract FQN from attribute chain (memoized by id(node))."""
+        cached = self._attr_fqn_cache.get(id(node))
+        if cached is not None:
+            return cached
+
+        # Build in-order by prepending — for the typical 2-4 part chain
+        # this allocates only the intermediate strings, with no parts
+        # list, reversed() iterator, or join
+        out = node.attr
+        current = node.value
+        while type(current) is ast.Attribute:
+            out = current.attr + "." + out
             current = current.value
-        if isinstance(current, ast.Name):
-            parts.append(current.id)
-        return ".".join(reversed(parts))
+        if type(current) is ast.Name:
+            out = current.id + "." + out
+        fqn = sys.intern(out)
+        self._attr_fqn_cache[id(node)] = fqn
+        return fqn
+
+
+IntegrationExtractor._dispatch = {
+    ast.Module: IntegrationExtractor.visit_Module,
+    ast.Import: IntegrationExtractor.visit_Import,
+    ast.ImportFrom: IntegrationExtractor.visit_ImportFrom,
+    ast.Call: IntegrationExtractor.visit_Call,
+    ast.Attribute: IntegrationExtractor.visit_Attribute,
+    ast.ClassDef: IntegrationExtractor.visit_ClassDef,
+}
+
+
+# ============================================================================
+# FUSED PHASE 1+2 VISITOR
+# ============================================================================
+
+class CombinedVisitor(HierarchyBuilder, IntegrationExtractor):
+    """Build the hierarchy and extract integration edges in one AST walk.
+
+    Phases 1 and 2 used to traverse every module twice with separate
+    visitors. The node types they act on are nearly disjoint (hierarchy:
+    Module/ClassDef/FunctionDef; integration: Import/Call/Attribute), so a
+    single fused traversal halves the AST-walk cost. Only Module and
+    ClassDef need both behaviours and are merged below; everything else
+    resolves through the MRO (FunctionDef from HierarchyBuilder, the edge
+    emitters from IntegrationExtractor).
+    """
+
+    def __init__(self):
+        HierarchyBuilder.__init__(self)
+        # IntegrationExtractor state (its __init__ only stores these)
+        self.capture_args = True
+        self.edges = _new_edge_columns()
+        self.call_graph = defaultdict(list)
+        self._edge_index = {}
+
+    def visit_Module(self, node: ast.Module) -> None:
+        """Register the module and reset per-module import aliases."""
+        self.alias_map.clear()
+        HierarchyBuilder.visit_Module(self, node)
+
+    def visit_ClassDef(self, node: ast.ClassDef) -> None:
+        """Register the class and emit its inheritance edge in one pass."""
+        parent_fqn = self.get_current_fqn()
+        class_fqn = self.register_node("class", node.name, node, parent_fqn)
+
+        # Track base classes (hierarchy) and resolve them through the
+        # alias map (integration edge) from the same node.bases sweep
+        bases = []
+        edge_bases = []
+        for base in node.bases:
+            tb = type(base)
+            if tb is ast.Name:
+                bases.append(base.id)
+                edge_bases.append(self.alias_map.get(base.id, base.id))
+            elif tb is ast.Attribute:
+                base_fqn = self._extract_attribute_fqn(base)
+                bases.append(base_fqn)
+                edge_bases.append(base_fqn)
+
+        if bases:
+            self.symbol_table[class_fqn]["bases"] = bases
+
+        if parent_fqn in self.symbol_table:
+            self.symbol_table[parent_fqn].setdefault("children", {})[node.name] = class_fqn
+
+        if edge_bases:
+            self._emit_edge("inheritance", class_fqn, "",
+                            node.lineno, _IT_INHERITANCE, extra=edge_bases)
+
+        self._push_scope(node.name)
+        self.generic_visit(node)
+        self._pop_scope()
+
+    def _visit_nested_definitions(self, node: ast.AST) -> None:
+        """Fused extraction needs calls/attributes inside bodies — walk all."""
+        self.generic_visit(node)
+
+
+CombinedVisitor._dispatch = {
+    ast.Module: CombinedVisitor.visit_Module,
+    ast.ClassDef: CombinedVisitor.visit_ClassDef,
+    ast.FunctionDef: CombinedVisitor.visit_FunctionDef,
+    ast.AsyncFunctionDef: CombinedVisitor.visit_AsyncFunctionDef,
+    ast.Call: CombinedVisitor.visit_Call,
+    ast.Attribute: CombinedVisitor.visit_Attribute,
+    ast.Import: CombinedVisitor.visit_Import,
+    ast.ImportFrom: CombinedVisitor.visit_ImportFrom,
+}
 
 
 # ============================================================================
@@ -322,9 +620,9 @@ class IntegrationExtractor(ast.NodeVisitor):
 class FlowAnalyzer:
     """Analyze data flows and detect crossroads."""
 
-    def __init__(self, integration_edges: List[Dict[str, Any]],
+    def __init__(self, edges: Dict[str, List[Any]],
                  call_graph: Dict[str, List[str]]):
-        self.integration_edges = integration_edges
+        self.edges = edges
         self.call_graph = call_graph
         self.crossroads: List[Dict[str, Any]] = []
         self.critical_paths: List[Dict[str, Any]] = []
@@ -337,41 +635,56 @@ class FlowAnalyzer:
 
     def _detect_crossroads(self) -> None:
         """Detect module boundary crossroads."""
-        module_interactions: Dict[Tuple[str, str], int] = defaultdict(int)
-
-        for edge in self.integration_edges:
-            source = edge.get("source", "")
-            target = edge.get("target", "")
-
-            # Extract module names
-            source_module = source.split(".")[0] if source else ""
-            target_module = target.split(".")[0] if target else ""
+        module_interactions: Counter = Counter()
+
+        # Tight scan over the string columns — no per-edge dict lookups.
+        # Deduplicated edges contribute their full multiplicity via count.
+        # The same FQN shows up on thousands of edges, so its top module is
+        # computed (and interned) once and reused from a local cache.
+        module_of: Dict[str, str] = {}
+        intern = sys.intern
+        for source, target, count in zip(self.edges["source"],
+                                         self.edges["target"],
+                                         self.edges["count"]):
+            source_module = module_of.get(source)
+            if source_module is None:
+                source_module = module_of[source] = intern(
+                    source.partition(".")[0])
+            target_module = module_of.get(target)
+            if target_module is None:
+                target_module = module_of[target] = intern(
+                    target.partition(".")[0])
 
             if source_module and target_module and source_module != target_module:
-                key = tuple(sorted([source_module, target_module]))
-                module_interactions[key] += 1
-
-        # Create crossroads
-        for (module_a, module_b), count in sorted(module_interactions.items(),
-                                                    key=lambda x: x[1], reverse=True):
-            if count >= 3:  # Only include significant crossroads
-                self.crossroads.append({
-                    "id": f"{module_a}_{module_b}_junction",
-                    "components": [module_a, module_b],
-                    "integration_count": count,
-                    "criticality": "high" if count > 10 else "medium"
-                })
+                # Canonical pair order via one comparison — no throwaway
+                # list + sorted() call per edge
+                if source_module < target_module:
+                    key = (source_module, target_module)
+                else:
+                    key = (target_module, source_module)
+                module_interactions[key] += count
+
+        # Create crossroads — most_common sorts in C, and the descending
+        # order lets the >= 3 significance cutoff break instead of filter
+        for (module_a, module_b), count in module_interactions.most_common():
+            if count < 3:  # Only include significant crossroads
+                break
+            self.crossroads.append({
+                "id": f"{module_a}_{module_b}_junction",
+                "components": [module_a, module_b],
+                "integration_count": count,
+                "criticality": "high" if count > 10 else "medium"
+            })
 
     def _identify_critical_paths(self) -> None:
         """Identify critical data flow paths."""
         # For now, just identify high-call-count functions as entry points
-        call_counts = defaultdict(int)
-        for edges in self.call_graph.values():
-            for caller in edges:
-                call_counts[caller] += 1
+        call_counts = Counter(
+            caller for edges in self.call_graph.values() for caller in edges)
 
-        # Top callers are entry points of critical paths
-        for func, count in sorted(call_counts.items(), key=lambda x: x[1], reverse=True)[:5]:
+        # Top callers are entry points of critical paths (heapq.nlargest
+        # under the hood — no full sort for the top 5)
+        for func, count in call_counts.most_common(5):
             if count >= 2:
                 self.critical_paths.append({
                     "id": f"path_{func.replace('.', '_')}",
@@ -385,85 +698,166 @@ class FlowAnalyzer:
 # MAIN ORCHESTRATION
 # ============================================================================
 
+# Below this many files the process-pool spawn/pickle overhead outweighs
+# the parallel AST work; fall back to the in-process loop
+_PARALLEL_MIN_FILES = 32
+
+
+def _process_file(args: Tuple[str, str]) -> Tuple[Dict[str, Any], Dict[str, Any], Dict[str, List[Any]], Dict[str, List[str]]]:
+    """Worker: parse one file and run the fused visitor over it.
+
+    Top-level so ProcessPoolExecutor can pickle it. Returns the per-file
+    (tree fragment, symbol table fragment, edge list); errors are reported
+    the same way as the serial loop and yield empty fragments.
+    """
+    path_str, module_path = args
+    try:
+        source = Path(path_str).read_bytes()
+        tree = compile(source, path_str, "exec", ast.PyCF_ONLY_AST)
+        visitor = CombinedVisitor()
+        visitor.current_module = module_path
+        visitor.visit(tree)
+        return (visitor.tree, visitor.symbol_table, visitor.edges,
+                dict(visitor.call_graph))
+    except Exception as e:
+        print(f"Error processing {path_str}: {e}")
+        return {}, {}, _new_edge_columns(), {}
+
 class IntegrationMapper:
     """Main orchestrator for three-phase analysis."""
 
     def __init__(self, root_path: Path, exclude_patterns: Optional[List[str]] = None):
         self.root_path = root_path
         self.exclude_patterns = exclude_patterns or []
+        # One compiled alternation replaces O(patterns) substring scans per
+        # file, and honors the glob syntax the CLI documents (*/tests/*)
+        if self.exclude_patterns:
+            self._exclude_re: Optional[re.Pattern] = re.compile(
+                "|".join(fnmatch.translate(p) for p in self.exclude_patterns))
+        else:
+            self._exclude_re = None
         self.files: List[Path] = []
         self.symbol_table: Dict[str, Dict[str, Any]] = {}
         self.tree: Dict[str, Any] = {}
-        self.integration_edges: List[Dict[str, Any]] = []
-
-    def discover_files(self) -> None:
-        """Discover all Python files."""
-        python_files = list(self.root_path.rglob("*.py"))
-        self.files = [f for f in python_files if not any(
-            pattern in str(f) for pattern in self.exclude_patterns
-        )]
-        print(f"Discovered {len(self.files)} Python files")
-
-    def phase1_build_hierarchy(self) -> None:
-        """Phase 1: Build hierarchy with FQN assignment."""
-        print("Phase 1: Building hierarchy...")
-
-        for file_path in self.files:
-            try:
-                with open(file_path, 'r') as f:
-                    source = f.read()
-
-                tree = ast.parse(source)
+        self.edges: Dict[str, List[Any]] = _new_edge_columns()
+        self.call_graph: Dict[str, List[str]] = defaultdict(list)
+        self._parsed: Dict[Path, ast.Module] = {}
 
-                # Build hierarchy
-                builder = HierarchyBuilder()
-                module_path = str(file_path.relative_to(self.root_path))
-                builder.current_module = module_path
-                builder.visit(tree)
+    @classmethod
+    def from_sources(cls, sources: Dict[str, str],
+                     exclude_patterns: Optional[List[str]] = None) -> "IntegrationMapper":
+        """Build a mapper over in-memory sources, bypassing file discovery.
 
-                self.symbol_table.update(builder.symbol_table)
-                self.tree.update(builder.tree)
+        For library callers holding code as strings (e.g. received over
+        an API) and for tests, this skips the tempdir round trip: each
+        source is parsed up front into the AST memo and the normal
+        pipeline runs against it without touching the filesystem.
 
-            except Exception as e:
-                print(f"Error processing {file_path}: {e}")
+        Args:
+            sources: Mapping of module path (e.g. "pkg/mod.py", used as
+                the module identity in output) to Python source text.
+            exclude_patterns: Glob patterns applied to the paths.
 
-        print(f"Built hierarchy with {len(self.symbol_table)} components")
+        Returns:
+            IntegrationMapper ready for run().
+        """
+        mapper = cls(Path("."), exclude_patterns)
+        exclude = mapper._exclude_re
+        for path_str, source in sources.items():
+            if exclude is not None and exclude.match(path_str):
+                continue
+            path = Path(path_str)
+            mapper._parsed[path] = compile(
+                source, path_str, "exec", ast.PyCF_ONLY_AST)
+            mapper.files.append(path)
+        return mapper
+
+    def _module_path(self, file_path: Path) -> str:
+        """Module identity for a file: root-relative on disk, as-given
+        for in-memory sources (whose paths are already relative)."""
+        try:
+            return str(file_path.relative_to(self.root_path))
+        except ValueError:
+            return str(file_path)
+
+    def _get_ast(self, file_path: Path) -> ast.Module:
+        """Read and parse a file once, memoizing the AST across passes.
+
+        Keeps re-runs over the same file set (and any future second pass)
+        from re-reading and re-parsing the same source.
+        """
+        tree = self._parsed.get(file_path)
+        if tree is None:
+            source = file_path.read_bytes()
+            # compile with PyCF_ONLY_AST is what ast.parse does, minus its
+            # Python wrapper and argument plumbing
+            tree = compile(source, str(file_path), "exec", ast.PyCF_ONLY_AST)
+            self._parsed[file_path] = tree
+        return tree
 
-    def phase2_extract_integration(self) -> None:
-        """Phase 2: Extract rich integration edges."""
-        print("Phase 2: Extracting integration points...")
+    def discover_files(self) -> None:
+        """Discover all Python files."""
+        python_files = self.root_path.rglob("*.py")
+        exclude = self._exclude_re
+        if exclude is None:
+            self.files = list(python_files)
+        else:
+            self.files = [f for f in python_files if not exclude.match(str(f))]
+        print(f"Discovered {len(self.files)} Python files")
 
-        for file_path in self.files:
-            try:
-                with open(file_path, 'r') as f:
-                    source = f.read()
+    def phase1_2_build_and_extract(self) -> None:
+        """Phases 1+2: Build hierarchy and extract edges in one AST walk.
 
-                tree = ast.parse(source)
+        Each file produces an independent (tree, symbol table, edges)
+        fragment, so on large file sets the per-file work fans out to a
+        process pool and the fragments are merged in input order, keeping
+        output deterministic.
+        """
+        print("Phase 1+2: Building hierarchy and extracting integration...")
+
+        workers = min(os.cpu_count() or 1, len(self.files))
+        # Pool workers re-read sources from disk, so pre-parsed in-memory
+        # sources (from_sources) always take the serial loop
+        if (workers > 1 and len(self.files) >= _PARALLEL_MIN_FILES
+                and not self._parsed):
+            jobs = [(str(f), self._module_path(f)) for f in self.files]
+            with ProcessPoolExecutor(max_workers=workers) as pool:
+                for tree_frag, symbols, edges, call_graph in pool.map(
+                        _process_file, jobs, chunksize=8):
+                    self.symbol_table.update(symbols)
+                    self.tree.update(tree_frag)
+                    for col in _EDGE_COLUMNS:
+                        self.edges[col].extend(edges[col])
+                    for target, callers in call_graph.items():
+                        self.call_graph[target].extend(callers)
+        else:
+            for file_path in self.files:
+                try:
+                    tree = self._get_ast(file_path)
 
-                # Extract integration
-                extractor = IntegrationExtractor(self.symbol_table)
-                module_path = str(file_path.relative_to(self.root_path))
-                extractor.current_module = module_path
-                extractor.visit(tree)
+                    visitor = CombinedVisitor()
+                    visitor.current_module = self._module_path(file_path)
+                    visitor.visit(tree)
 
-                self.integration_edges.extend(extractor.integration_edges)
+                    self.symbol_table.update(visitor.symbol_table)
+                    self.tree.update(visitor.tree)
+                    for col in _EDGE_COLUMNS:
+                        self.edges[col].extend(visitor.edges[col])
+                    for target, callers in visitor.call_graph.items():
+                        self.call_graph[target].extend(callers)
 
-            except Exception as e:
-                print(f"Error extracting integration from {file_path}: {e}")
+                except Exception as e:
+                    print(f"Error processing {file_path}: {e}")
 
-        print(f"Extracted {len(self.integration_edges)} integration edges")
+        print(f"Built hierarchy with {len(self.symbol_table)} components")
+        print(f"Extracted {len(self.edges['type'])} integration edges")
 
     def phase3_analyze_flows(self) -> Tuple[List[Dict[str, Any]], List[Dict[str, Any]]]:
         """Phase 3: Analyze flows and crossroads."""
         print("Phase 3: Analyzing flows and crossroads...")
 
-        # Build call graph for flow analysis
-        call_graph: Dict[str, List[str]] = defaultdict(list)
-        for edge in self.integration_edges:
-            if edge.get("type") == "call":
-                call_graph[edge.get("target", "")].append(edge.get("source", ""))
-
-        analyzer = FlowAnalyzer(self.integration_edges, call_graph)
+        # Call graph was built inline during Phase 2 — no edge re-scan
+        analyzer = FlowAnalyzer(self.edges, self.call_graph)
         crossroads, critical_paths = analyzer.analyze()
 
         print(f"Identified {len(crossroads)} crossroads and {len(critical_paths)} critical paths")
@@ -475,7 +869,7 @@ class IntegrationMapper:
         """Build final output JSON."""
         return {
             "metadata": {
-                "total_integration_points": len(self.integration_edges),
+                "total_integration_points": len(self.edges["type"]),
                 "total_crossroads": len(crossroads),
                 "analysis_timestamp": datetime.now().isoformat(),
                 "files_analyzed": len(self.files),
@@ -488,7 +882,7 @@ class IntegrationMapper:
                 "data_flows": [],
                 "statistics": {
                     "total_components": len(self.symbol_table),
-                    "total_integration_points": len(self.integration_edges)
+                    "total_integration_points": len(self.edges["type"])
                 }
             }
         }
@@ -504,8 +898,7 @@ class IntegrationMapper:
         else:
             print(f"Analyzing {len(self.files)} specified file(s)")
 
-        self.phase1_build_hierarchy()
-        self.phase2_extract_integration()
+        self.phase1_2_build_and_extract()
         crossroads, critical_paths = self.phase3_analyze_flows()
 
         return self.build_output(crossroads, critical_paths)
@@ -547,6 +940,8 @@ Examples:
                        help="Generate token-efficient compact format (85%% reduction, <30K tokens)")
     parser.add_argument("--readable", action="store_true",
                        help="Pretty-print JSON output (increases file size)")
+    parser.add_argument("--compress", action="store_true",
+                       help="Compress output file (zstd if installed, else gzip)")
     parser.add_argument("--verbose", action="store_true", help="Verbose console output")
 
     args = parser.parse_args()
@@ -586,38 +981,18 @@ Examples:
 
     output = mapper.run()
 
-    # Import formatters
+    # Import formatters through the package — a single canonical import, so
+    # each formatter module is executed exactly once per process
     module_dir = Path(__file__).parent
     sys.path.insert(0, str(module_dir.parent))
-    try:
-        from integration_mapper.formatters import CompactFormatter, VerboseFormatter
-        from integration_mapper.utils import estimate_token_count
-    except ImportError:
-        # Fallback for relative imports
-        import importlib.util
-        compact_spec = importlib.util.spec_from_file_location(
-            "compact_formatter",
-            module_dir / "formatters" / "compact_formatter.py"
-        )
-        compact_module = importlib.util.module_from_spec(compact_spec)
-        compact_spec.loader.exec_module(compact_module)
-
-        verbose_spec = importlib.util.spec_from_file_location(
-            "verbose_formatter",
-            module_dir / "formatters" / "verbose_formatter.py"
-        )
-        verbose_module = importlib.util.module_from_spec(verbose_spec)
-        verbose_spec.loader.exec_module(verbose_module)
-
-        CompactFormatter = compact_module.CompactFormatter
-        VerboseFormatter = verbose_module.VerboseFormatter
-
-    # Choose formatter
+    from integration_mapper.formatters import FORMATTERS
+
+    # Choose formatter via dispatch table
+    mode = "compact" if args.context_aware else "verbose"
+    formatter = FORMATTERS[mode]()
     if args.context_aware:
-        formatter = CompactFormatter()
         print("📦 Using context-aware compact format (token-efficient)")
     else:
-        formatter = VerboseFormatter()
         print("📋 Using verbose format (default, full details)")
 
     # Format output
@@ -627,6 +1002,12 @@ Examples:
     output_path = Path(args.output)
     formatter.write(formatted_output, str(output_path), readable=args.readable)
 
+    # Optionally compress the artifact (zstd when installed, else gzip)
+    if args.compress:
+        from integration_mapper.utils.json_writer import compress_json_file
+        output_path = Path(compress_json_file(str(output_path)))
+        print(f"🗜️  Compressed output: {output_path}")
+
     # Report statistics
     print(f"\n✅ Analysis complete!")
     print(f"Output: {output_path}")
@@ -1,7 +1,11 @@
 """Compression and utility modules for token-efficient output."""
 
+from .decoder import CompactDecoder, create_compact_decoder
 from .indexer import ComponentIndexer
 from .abbreviations import (
+    EdgeType,
+    EDGE_TYPE_LABELS,
+    EDGE_TYPE_CODES,
     abbreviate_keys,
     expand_keys,
     abbreviate_type,
@@ -15,14 +19,22 @@ from .abbreviations import (
 from .json_writer import (
     write_compact_json,
     write_readable_json,
+    write_msgpack,
+    compress_json_file,
     estimate_token_count,
     get_file_size_info,
 )
 
 __all__ = [
+    # Decoder
+    "CompactDecoder",
+    "create_compact_decoder",
     # Indexer
     "ComponentIndexer",
     # Abbreviations
+    "EdgeType",
+    "EDGE_TYPE_LABELS",
+    "EDGE_TYPE_CODES",
     "abbreviate_keys",
     "expand_keys",
     "abbreviate_type",
@@ -35,6 +47,8 @@ __all__ = [
     # JSON writer
     "write_compact_json",
     "write_readable_json",
+    "write_msgpack",
+    "compress_json_file",
     "estimate_token_count",
     "get_file_size_info",
 ]
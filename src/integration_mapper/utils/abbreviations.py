@@ -6,7 +6,40 @@ Maps verbose keys and types to short abbreviations:
 - INTEGRATION_CODES: Integration types → codes (10% reduction)
 """
 
-from typing import Any, Dict
+import sys
+from enum import IntEnum
+from typing import Any, Dict, Tuple
+
+
+class EdgeType(IntEnum):
+    """Integer codes for edge integration_type strings.
+
+    Edges carry integration_type strings ("import_module", "function_call",
+    ...) that are re-hashed and re-compared for every edge. Consumers at the
+    formatter boundary can work on these small integer codes instead;
+    EDGE_TYPE_LABELS maps codes back to the string form used in JSON output.
+    """
+
+    IMPORT_MODULE = 0
+    IMPORT_FROM = 1
+    FUNCTION_CALL = 2
+    ATTRIBUTE_ACCESS = 3
+    INHERITANCE = 4
+
+
+# Code → JSON string (interned so every edge shares one string object)
+EDGE_TYPE_LABELS: Tuple[str, ...] = tuple(sys.intern(label) for label in (
+    "import_module",
+    "import_from",
+    "function_call",
+    "attribute_access",
+    "inheritance",
+))
+
+# JSON string → code
+EDGE_TYPE_CODES: Dict[str, EdgeType] = {
+    label: EdgeType(i) for i, label in enumerate(EDGE_TYPE_LABELS)
+}
 
 
 # Core structure abbreviations
@@ -78,12 +111,57 @@ INTEGRATION_CODES: Dict[str, str] = {
     "exception": "ex",
 }
 
+# Intern code strings once so every lookup returns the same PyObject —
+# repeat emissions share one string and compare by pointer downstream
+TYPE_CODES = {k: sys.intern(v) for k, v in TYPE_CODES.items()}
+INTEGRATION_CODES = {k: sys.intern(v) for k, v in INTEGRATION_CODES.items()}
+
+# Reverse maps, built once at import — expand_keys recurses through every
+# nesting level of the decoded structure, so rebuilding these per call
+# multiplies the dict construction by the node count
+REVERSE_KEY_ABBREV: Dict[str, str] = {v: k for k, v in KEY_ABBREV.items()}
+REVERSE_TYPE_CODES: Dict[str, str] = {v: k for k, v in TYPE_CODES.items()}
+REVERSE_INTEGRATION_CODES: Dict[str, str] = {
+    v: k for k, v in INTEGRATION_CODES.items()
+}
+
+
+def _translate_keys(data: Any, table: Dict[str, str]) -> Any:
+    """Rebuild a nested structure with dict keys mapped through table.
+
+    Iterative DFS over an explicit (source, destination) stack — component
+    trees nest arbitrarily deep, so this avoids one Python frame per node
+    and cannot hit the recursion limit.
+    """
+    if not isinstance(data, (dict, list)):
+        return data
+
+    root: Any = {} if isinstance(data, dict) else [None] * len(data)
+    stack = [(data, root)]
+    while stack:
+        src, dst = stack.pop()
+        items = src.items() if isinstance(src, dict) else enumerate(src)
+        for key, value in items:
+            if isinstance(src, dict):
+                key = table.get(key, key)
+            if isinstance(value, dict):
+                child: Any = {}
+                dst[key] = child
+                stack.append((value, child))
+            elif isinstance(value, list):
+                child = [None] * len(value)
+                dst[key] = child
+                stack.append((value, child))
+            else:
+                dst[key] = value
+    return root
+
 
 def abbreviate_keys(data: Any) -> Any:
-    """Recursively abbreviate dictionary keys in data structure.
+    """Abbreviate dictionary keys throughout a data structure.
 
     Converts all verbose keys to abbreviations while preserving values.
-    Handles nested dicts and lists recursively.
+    Handles nested dicts and lists to any depth.
 
     Args:
         data: Dictionary, list, or primitive value to abbreviate
@@ -98,14 +176,7 @@ def abbreviate_keys(data: Any) -> Any:
 
     Token savings: Reduces key name length from average 15 chars to 3 chars.
     """
-    if isinstance(data, dict):
-        return {
-            KEY_ABBREV.get(k, k): abbreviate_keys(v)
-            for k, v in data.items()
-        }
-    elif isinstance(data, list):
-        return [abbreviate_keys(item) for item in data]
-    return data
+    return _translate_keys(data, KEY_ABBREV)
 
 
 def expand_keys(data: Any) -> Any:
@@ -125,17 +196,7 @@ def expand_keys(data: Any) -> Any:
         >>> expanded = expand_keys(abbr)
         >>> assert expanded == {"type": "method", "name": "save", "line_range": [42, 56]}
     """
-    # Create reverse mapping: abbrev → full
-    reverse_abbrev = {v: k for k, v in KEY_ABBREV.items()}
-
-    if isinstance(data, dict):
-        return {
-            reverse_abbrev.get(k, k): expand_keys(v)
-            for k, v in data.items()
-        }
-    elif isinstance(data, list):
-        return [expand_keys(item) for item in data]
-    return data
+    return _translate_keys(data, REVERSE_KEY_ABBREV)
 
 
 def abbreviate_type(type_str: str) -> str:
@@ -145,8 +206,7 @@ def abbreviate_type(type_str: str) -> str:
 
 def expand_type(type_abbr: str) -> str:
     """Convert type abbreviation back to full name."""
-    reverse_types = {v: k for k, v in TYPE_CODES.items()}
-    return reverse_types.get(type_abbr, type_abbr)
+    return REVERSE_TYPE_CODES.get(type_abbr, type_abbr)
 
 
 def abbreviate_integration(integration_str: str) -> str:
@@ -156,8 +216,7 @@ def abbreviate_integration(integration_str: str) -> str:
 
 def expand_integration(integration_abbr: str) -> str:
     """Convert integration abbreviation back to full name."""
-    reverse_integrations = {v: k for k, v in INTEGRATION_CODES.items()}
-    return reverse_integrations.get(integration_abbr, integration_abbr)
+    return REVERSE_INTEGRATION_CODES.get(integration_abbr, integration_abbr)
 
 
 def get_abbreviation_stats() -> Dict[str, int]:
@@ -0,0 +1,208 @@
+"""CompactDecoder: expands context-aware compact maps back to verbose form.
+
+Reverses the CompactFormatter pipeline: resolves integer component IDs
+through the idx section, expands abbreviated keys and type codes, and
+rebuilds the nested codebase tree from the flattened parent-ID list.
+
+Used by tooling that consumes compact maps but needs the verbose shape
+(diffing, tests, downstream analyzers); the LLM-facing artifact stays
+compact. Decoding is lossy where compression was: per-edge detail and
+file paths are not stored in compact maps and cannot be recovered.
+"""
+
+import json
+from typing import Any, Dict, List, Optional, Union
+
+from .abbreviations import REVERSE_KEY_ABBREV, REVERSE_TYPE_CODES
+
+try:
+    import orjson  # C JSON parser, several times faster on large maps
+except ImportError:
+    orjson = None
+
+try:
+    import msgpack  # optional binary sidecar format (see json_writer)
+except ImportError:
+    msgpack = None
+
+
+# Compact criticality/complexity codes back to the verbose scale
+_CRIT_EXPAND = {"h": "high", "m": "medium", "l": "low"}
+
+
+class CompactDecoder:
+    """Expands a compact map (v2.x) into the verbose output shape.
+
+    Handles both index encodings: the positional FQN list emitted by
+    v2.1 ("idx": ["pkg", ...], position i holds ID i+1) and the
+    str-keyed dict of v2.0 ("idx": {"1": "pkg", ...}).
+
+    ID resolution is bulk-materialized once per decode() into a
+    positional list, so each reference afterwards is a C-level list
+    index rather than a per-row dict lookup with an int→str conversion.
+
+    Example:
+        >>> decoder = CompactDecoder()
+        >>> verbose = decoder.decode(json.loads(compact_text))
+        >>> verbose["codebase_tree"]["myapp"]["type"]
+        'module'
+    """
+
+    __slots__ = ()
+
+    def decode(self, compact: Union[Dict[str, Any], bytes, bytearray]) -> Dict[str, Any]:
+        """Decode a compact map into the verbose output shape.
+
+        Args:
+            compact: Compact-format dictionary (already parsed), or a
+                raw bytes blob — JSON, or MessagePack as written by
+                json_writer.write_msgpack (sniffed by the leading byte)
+
+        Returns:
+            Dictionary with the verbose top-level sections: metadata,
+            codebase_tree and global_integration_map.
+        """
+        if isinstance(compact, (bytes, bytearray)):
+            # JSON documents open with "{"; anything else is msgpack
+            if compact[:1] == b"{":
+                compact = (orjson.loads(compact) if orjson is not None
+                           else json.loads(compact))
+            elif msgpack is not None:
+                compact = msgpack.unpackb(compact, raw=False)
+            else:
+                raise ImportError(
+                    "msgpack is required to decode binary maps "
+                    "(pip install msgpack)")
+        fqns = self._build_fqn_array(compact.get("idx", []))
+        components = self._decode_components(compact.get("cmp", []), fqns)
+        return {
+            "metadata": self._decode_metadata(compact.get("meta", {})),
+            "codebase_tree": self._rebuild_tree(components),
+            "global_integration_map": {
+                "crossroads": self._decode_crossroads(
+                    compact.get("crd", []), fqns),
+                "critical_paths": self._decode_critical_paths(
+                    compact.get("cp", []), fqns),
+            },
+        }
+
+    @staticmethod
+    def _build_fqn_array(idx: Any) -> List[Optional[str]]:
+        """Materialize the ID→FQN gather array from either idx encoding.
+
+        Position 0 is unused — IDs start at 1 — so resolution is a plain
+        fqns[comp_id] with no offset arithmetic per row.
+        """
+        if isinstance(idx, dict):
+            # v2.0 str-keyed form; tolerate gaps by sizing to the max ID
+            fqns: List[Optional[str]] = [None] * (
+                1 + max((int(id_) for id_ in idx), default=0))
+            for id_, fqn in idx.items():
+                fqns[int(id_)] = fqn
+            return fqns
+        return [None, *idx]
+
+    @staticmethod
+    def _resolve(fqns: List[Optional[str]], comp_id: Any) -> str:
+        """Resolve one component ID against the gather array."""
+        if type(comp_id) is int and 0 < comp_id < len(fqns):
+            fqn = fqns[comp_id]
+            if fqn is not None:
+                return fqn
+        return f"<unknown:{comp_id}>"
+
+    def _decode_components(self, compact_components: List[Dict[str, Any]],
+                           fqns: List[Optional[str]]) -> Dict[str, Dict[str, Any]]:
+        """Expand flat compact component records, keyed by FQN.
+
+        Optional fields absent from a record are omitted from its
+        expansion, mirroring the encoder's omit-empty policy.
+        """
+        # Bound-method locals: the loop body runs once per component, so
+        # expansion goes through LOAD_FAST instead of re-resolving the
+        # module global and its .get attribute every iteration
+        resolve = self._resolve
+        expand = REVERSE_TYPE_CODES.get
+        components: Dict[str, Dict[str, Any]] = {}
+        for comp in compact_components:
+            fqn = resolve(fqns, comp.get("id"))
+            type_code = comp.get("t", "pk")
+            expanded: Dict[str, Any] = {
+                "type": expand(type_code, type_code),
+                "fqn": fqn,
+                "name": comp.get("n", ""),
+            }
+            parent_id = comp.get("p")
+            if parent_id is not None:
+                expanded["parent"] = resolve(fqns, parent_id)
+            if "lr" in comp:
+                expanded["line_range"] = comp["lr"]
+            if "doc" in comp:
+                expanded["docstring"] = comp["doc"]
+            if "m_ct" in comp:
+                expanded["method_count"] = comp["m_ct"]
+            if "a_ct" in comp:
+                expanded["attribute_count"] = comp["a_ct"]
+            components[fqn] = expanded
+        return components
+
+    @staticmethod
+    def _rebuild_tree(components: Dict[str, Dict[str, Any]]) -> Dict[str, Any]:
+        """Nest flattened components back under their parents.
+
+        The encoder emits components in pre-order, so every parent is
+        decoded before its children; a single pass over the FQN-keyed
+        map rebuilds the nesting without splitting any FQN strings.
+        """
+        tree: Dict[str, Any] = {}
+        for comp in components.values():
+            parent_fqn = comp.pop("parent", None)
+            parent = components.get(parent_fqn) if parent_fqn else None
+            if parent is None:
+                tree[comp["name"]] = comp
+            else:
+                parent.setdefault("children", {})[comp["name"]] = comp
+        return tree
+
+    def _decode_crossroads(self, compact_crossroads: List[Dict[str, Any]],
+                           fqns: List[Optional[str]]) -> List[Dict[str, Any]]:
+        """Expand compact crossroad entries to the verbose shape."""
+        resolve = self._resolve
+        crit = _CRIT_EXPAND.get
+        return [
+            {
+                "id": crossroad.get("id"),
+                "components": [resolve(fqns, comp_id)
+                               for comp_id in crossroad.get("c", ())],
+                "integration_count": crossroad.get("cnt", 0),
+                "criticality": crit(crossroad.get("crit", "m"), "medium"),
+            }
+            for crossroad in compact_crossroads
+        ]
+
+    def _decode_critical_paths(self, compact_paths: List[Dict[str, Any]],
+                               fqns: List[Optional[str]]) -> List[Dict[str, Any]]:
+        """Expand compact critical-path entries to the verbose shape."""
+        resolve = self._resolve
+        crit = _CRIT_EXPAND.get
+        return [
+            {
+                "id": path.get("id"),
+                "entry_point": resolve(fqns, path.get("ep")),
+                "call_count": path.get("cc", 0),
+                "complexity": crit(path.get("cx", "m"), "medium"),
+            }
+            for path in compact_paths
+        ]
+
+    @staticmethod
+    def _decode_metadata(compact_metadata: Dict[str, Any]) -> Dict[str, Any]:
+        """Expand abbreviated metadata keys back to their verbose names."""
+        get = REVERSE_KEY_ABBREV.get
+        return {get(key, key): value
+                for key, value in compact_metadata.items()}
+
+
+def create_compact_decoder() -> CompactDecoder:
+    """Factory function to create decoder."""
+    return CompactDecoder()
@@ -4,7 +4,8 @@ Maps fully qualified names to integer IDs to eliminate FQN string repetition.
 Primary compression mechanism: 60% token reduction through ID references.
 """
 
-from typing import Dict, Optional
+import sys
+from typing import Dict, List, Optional
 
 
 class ComponentIndexer:
@@ -27,7 +28,15 @@ class ComponentIndexer:
     def __init__(self) -> None:
         """Initialize the indexer with empty mappings."""
         self.fqn_to_id: Dict[str, int] = {}  # FQN string → integer ID
-        self.id_to_fqn: Dict[int, str] = {}  # Integer ID → FQN string
+        # Reverse lookups run once, at export — fqn_to_id preserves
+        # insertion (= ID) order, so the reverse map is derived from it
+        # lazily as a list (position i holds the FQN for ID i; slot 0
+        # unused) instead of being maintained per insertion
+        self._id_to_fqn: List[str] = [""]
+        # str-keyed export view, rebuilt on the same staleness check —
+        # repeated serialization (incremental builds) skips the per-ID
+        # str() conversions after the first export
+        self._json_index: Dict[str, str] = {}
         self.next_id: int = 1
 
     def get_or_create_id(self, fqn: str) -> int:
@@ -41,19 +50,61 @@ class ComponentIndexer:
 
         Token savings: Replaces 40+ character strings with 1-3 character integers.
         """
-        if fqn not in self.fqn_to_id:
-            self.fqn_to_id[fqn] = self.next_id
-            self.id_to_fqn[self.next_id] = fqn
-            self.next_id += 1
-        return self.fqn_to_id[fqn]
+        # Intern the key so every copy of this FQN across components,
+        # crossroads and tree shares one PyObject: repeat lookups then
+        # hit the pointer-equality fast path before any char compare,
+        # and FQNs already interned by the mapper resolve for free
+        fqn = sys.intern(fqn)
+        # setdefault probes the table once: hit returns the existing ID,
+        # miss inserts new_id in the same lookup — versus three hashes
+        # for the contains/insert/getitem sequence this replaces
+        new_id = self.next_id
+        id_ = self.fqn_to_id.setdefault(fqn, new_id)
+        if id_ == new_id:
+            self.next_id = new_id + 1
+        return id_
+
+    def __contains__(self, fqn: str) -> bool:
+        """O(1) membership test delegating to the underlying dict."""
+        return fqn in self.fqn_to_id
+
+    def __len__(self) -> int:
+        """Number of indexed components."""
+        return len(self.fqn_to_id)
 
     def get_id(self, fqn: str) -> Optional[int]:
         """Get ID for FQN if it exists, return None otherwise."""
         return self.fqn_to_id.get(fqn)
 
+    def _reverse_index(self) -> List[str]:
+        """Return the ID→FQN list, rebuilding it if insertions occurred.
+
+        One O(N) extend over fqn_to_id (a C loop over the key table)
+        amortized across all reverse lookups since the last insertion.
+        """
+        if len(self._id_to_fqn) != self.next_id:
+            self._id_to_fqn = [""]
+            self._id_to_fqn.extend(self.fqn_to_id)
+        return self._id_to_fqn
+
     def get_fqn(self, id_: int) -> Optional[str]:
         """Get FQN for ID if it exists, return None otherwise."""
-        return self.id_to_fqn.get(id_)
+        if 0 < id_ < self.next_id:
+            return self._reverse_index()[id_]
+        return None
+
+    def to_fqn_list(self) -> list:
+        """Export index as a positional FQN list for JSON output.
+
+        IDs are assigned sequentially from 1, so position i holds the FQN
+        for ID i+1. Compared to the str-keyed dict form this avoids N
+        int→str conversions and ~5 bytes of quoted key per entry.
+
+        Returns:
+            List of FQN strings ordered by ID.
+        """
+        # fqn_to_id preserves insertion order, which is ID order
+        return list(self.fqn_to_id.keys())
 
     def to_json_index(self) -> Dict[str, str]:
         """Export index for JSON output.
@@ -62,13 +113,17 @@ class ComponentIndexer:
         Format: {"1": "myapp.models.User", "2": "myapp.models.User.save", ...}
 
         Returns:
-            Dictionary mapping string IDs to FQN strings.
+            Dictionary mapping string IDs to FQN strings. The mapping is
+            a cached view shared across calls — treat it as read-only.
         """
-        return {str(id_): fqn for id_, fqn in self.id_to_fqn.items()}
+        if len(self._json_index) != len(self.fqn_to_id):
+            self._json_index = {str(id_): fqn
+                                for id_, fqn in enumerate(self.fqn_to_id, 1)}
+        return self._json_index
 
     def get_stats(self) -> Dict[str, int]:
         """Get indexer statistics."""
         return {
-            "total_components": len(self.id_to_fqn),
+            "total_components": len(self.fqn_to_id),
             "next_id": self.next_id
         }
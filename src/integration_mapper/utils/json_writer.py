@@ -4,10 +4,33 @@ Provides functions for writing JSON in both compact (minified) and readable
 (pretty-printed) formats for different use cases.
 """
 
+import gzip
 import json
+import os
 from typing import Any, Dict
 from pathlib import Path
 
+try:
+    import orjson  # C/SIMD JSON encoder, several times faster on large trees
+except ImportError:
+    orjson = None
+
+try:
+    import msgpack  # binary framing for tool-to-tool handoff, no tokenizer
+except ImportError:
+    msgpack = None
+
+try:
+    import zstandard  # gzip-class ratios at several times the throughput
+except ImportError:
+    zstandard = None
+
+
+# One minifying encoder shared by every stdlib-fallback write: json.dumps
+# constructs and configures a fresh JSONEncoder per call, which adds up
+# when documents are written section by section
+_COMPACT_ENCODER = json.JSONEncoder(separators=(',', ':'), ensure_ascii=False)
+
 
 def write_compact_json(data: Dict[str, Any], filepath: str) -> None:
     """Write JSON in compact minified format (no whitespace).
@@ -23,15 +46,25 @@ def write_compact_json(data: Dict[str, Any], filepath: str) -> None:
         >>> data = {"v": "2.0", "idx": {"1": "myapp"}}
         >>> write_compact_json(data, "map_compact.json")
         # Output: {"v":"2.0","idx":{"1":"myapp"}}
+
+    The top-level sections are encoded one at a time into the open file,
+    so peak memory is bounded by the largest section (idx/cmp/crd), not
+    the whole serialized document.
     """
-    with open(filepath, 'w', encoding='utf-8') as f:
-        json.dump(
-            data,
-            f,
-            separators=(',', ':'),  # No spaces after separators
-            ensure_ascii=False,  # Allow unicode characters
-            sort_keys=False
-        )
+    with open(filepath, 'wb') as f:
+        f.write(b'{')
+        for i, (key, value) in enumerate(data.items()):
+            if i:
+                f.write(b',')
+            if orjson is not None:
+                f.write(orjson.dumps(key))
+                f.write(b':')
+                f.write(orjson.dumps(value))
+            else:
+                f.write(_COMPACT_ENCODER.encode(key).encode('utf-8'))
+                f.write(b':')
+                f.write(_COMPACT_ENCODER.encode(value).encode('utf-8'))
+        f.write(b'}')
 
 
 def write_readable_json(data: Dict[str, Any], filepath: str) -> None:
@@ -55,6 +88,9 @@ def write_readable_json(data: Dict[str, Any], filepath: str) -> None:
         #   }
         # }
     """
+    if orjson is not None:
+        Path(filepath).write_bytes(orjson.dumps(data, option=orjson.OPT_INDENT_2))
+        return
     with open(filepath, 'w', encoding='utf-8') as f:
         json.dump(
             data,
@@ -65,6 +101,116 @@ def write_readable_json(data: Dict[str, Any], filepath: str) -> None:
         )
 
 
+def write_json_sections(data: Dict[str, Any], filepath: str,
+                        readable: bool = False) -> None:
+    """Write a top-level JSON object to disk one section at a time.
+
+    Instead of serializing the whole document in one json.dump call, each
+    top-level section (metadata, codebase_tree, ...) is dumped separately
+    into the open file handle. Peak memory stays bounded by the largest
+    single section rather than the full serialized document.
+
+    Args:
+        data: Top-level dictionary to write
+        filepath: Output file path
+        readable: If True, pretty-print with 2-space indentation
+                  (output matches json.dump(indent=2))
+    """
+    if orjson is not None:
+        with open(filepath, 'wb') as f:
+            if readable:
+                f.write(b'{\n')
+                for i, (key, value) in enumerate(data.items()):
+                    section = orjson.dumps(value, option=orjson.OPT_INDENT_2)
+                    # Re-indent nested lines one level deeper
+                    section = section.replace(b'\n', b'\n  ')
+                    f.write(b'  ' + orjson.dumps(key) + b': ' + section)
+                    f.write(b',\n' if i < len(data) - 1 else b'\n')
+                f.write(b'}')
+            else:
+                f.write(b'{')
+                for i, (key, value) in enumerate(data.items()):
+                    if i:
+                        f.write(b',')
+                    f.write(orjson.dumps(key) + b':')
+                    f.write(orjson.dumps(value))
+                f.write(b'}')
+        return
+
+    with open(filepath, 'w', encoding='utf-8') as f:
+        if readable:
+            f.write('{\n')
+            for i, (key, value) in enumerate(data.items()):
+                section = json.dumps(value, indent=2, ensure_ascii=False)
+                # Re-indent nested lines one level deeper
+                section = section.replace('\n', '\n  ')
+                f.write(f'  {json.dumps(key)}: {section}')
+                f.write(',\n' if i < len(data) - 1 else '\n')
+            f.write('}')
+        else:
+            f.write('{')
+            for i, (key, value) in enumerate(data.items()):
+                if i:
+                    f.write(',')
+                f.write(_COMPACT_ENCODER.encode(key) + ':')
+                # iterencode keeps the streaming behavior json.dump had
+                for chunk in _COMPACT_ENCODER.iterencode(value):
+                    f.write(chunk)
+            f.write('}')
+
+
+def write_msgpack(data: Dict[str, Any], filepath: str) -> None:
+    """Write data as a MessagePack binary file (tool-to-tool handoff).
+
+    Same schema as the JSON output but binary-framed: ~20% smaller than
+    minified JSON and several times faster for downstream tools to
+    parse, since there is no text tokenization or escape handling.
+    JSON remains the human/LLM-facing format; use a distinct extension
+    (e.g. .msgpack) for these sidecar artifacts.
+
+    Requires the optional msgpack package — unlike the JSON writers
+    there is no stdlib fallback for the binary framing.
+
+    Args:
+        data: Dictionary to write
+        filepath: Output file path
+
+    Raises:
+        ImportError: If msgpack is not installed.
+    """
+    if msgpack is None:
+        raise ImportError(
+            "msgpack is required for binary output (pip install msgpack)")
+    Path(filepath).write_bytes(msgpack.packb(data, use_bin_type=True))
+
+
+def compress_json_file(filepath: str) -> str:
+    """Compress an emitted JSON artifact, replacing it on disk.
+
+    JSON graphs compress extremely well (repeated keys and FQN
+    prefixes), typically to ~20% of the original size. Uses zstandard
+    when installed, writing a .zst; otherwise falls back to stdlib
+    gzip, writing a .gz. The uncompressed file is removed.
+
+    Args:
+        filepath: Path of an already-written JSON file
+
+    Returns:
+        Path of the compressed artifact.
+    """
+    data = Path(filepath).read_bytes()
+    if zstandard is not None:
+        out = filepath + ".zst"
+        Path(out).write_bytes(
+            zstandard.ZstdCompressor(level=3).compress(data))
+    else:
+        out = filepath + ".gz"
+        with gzip.open(out, "wb", compresslevel=6) as f:
+            f.write(data)
+    os.remove(filepath)
+    return out
+
+
 def estimate_token_count(filepath: str) -> int:
     """Estimate token count of JSON file using rough approximation.
 
@@ -81,11 +227,12 @@ def estimate_token_count(filepath: str) -> int:
         >>> tokens = estimate_token_count("map_compact.json")
         >>> print(f"Estimated tokens: {tokens:,}")
     """
-    path = Path(filepath)
-    if not path.exists():
+    # One os.stat covers both the existence check and the size — the
+    # Path/exists/stat sequence was three syscalls and a Path object
+    try:
+        file_size = os.stat(filepath).st_size
+    except FileNotFoundError:
         raise FileNotFoundError(f"File not found: {filepath}")
-
-    file_size = path.stat().st_size
     # Rough estimate: ~4 bytes per token for JSON (conservative)
     return max(1, file_size // 4)
 
@@ -103,11 +250,10 @@ def get_file_size_info(filepath: str) -> Dict[str, Any]:
         >>> info = get_file_size_info("map_compact.json")
         >>> print(f"Size: {info['kb']:.1f} KB")
     """
-    path = Path(filepath)
-    if not path.exists():
+    try:
+        size_bytes = os.stat(filepath).st_size
+    except FileNotFoundError:
         raise FileNotFoundError(f"File not found: {filepath}")
-
-    size_bytes = path.stat().st_size
     return {
         "bytes": size_bytes,
         "kb": size_bytes / 1024,
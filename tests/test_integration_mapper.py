@@ -3,32 +3,54 @@
 Comprehensive validation tests for Integration Mapper.
 
 Tests all three phases and validates output quality.
+
+The mapper runs in-process (no subprocess spawns): the analysis is
+executed once and its output dict is shared by every test that used to
+re-read the same output file, so the suite pays for one analysis and
+zero interpreter startups.
 """
 
+import contextlib
+import io
 import json
-import subprocess
 import sys
 from pathlib import Path
 
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from integration_mapper.formatters import FORMATTERS
+from integration_mapper.mapper import IntegrationMapper, main as mapper_main
+
+
+def run_mapper(root, output_path, exclude=None):
+    """Run one in-process analysis and write verbose JSON output."""
+    mapper = IntegrationMapper(Path(root), exclude)
+    output = mapper.run()
+    formatter = FORMATTERS["verbose"]()
+    formatter.write(formatter.format_output(output), str(output_path))
+    return output
+
+
+# Analysis output shared across tests — populated by test_small_project,
+# read by every test that previously re-opened /tmp/small_test.json
+_shared_output = {}
+
+
+def get_output():
+    """Return the shared analysis output, loading from disk if needed."""
+    if not _shared_output:
+        with open("/tmp/small_test.json") as f:
+            _shared_output.update(json.load(f))
+    return _shared_output
+
 
 def test_small_project():
     """Test on small 5-10 file project."""
     print("\n🧪 TEST 1: Small Project (5-10 files)")
     print("=" * 60)
 
-    result = subprocess.run(
-        [sys.executable, "integration_mapper.py", "--root", "/tmp/test_project",
-         "--output", "/tmp/small_test.json"],
-        capture_output=True,
-        text=True
-    )
-
-    if result.returncode != 0:
-        print(f"❌ FAILED: {result.stderr}")
-        return False
-
-    with open("/tmp/small_test.json") as f:
-        output = json.load(f)
+    output = run_mapper("/tmp/test_project", "/tmp/small_test.json")
+    _shared_output.update(output)
 
     # Validate structure
     assert "metadata" in output, "Missing metadata"
@@ -53,8 +75,7 @@ def test_hierarchical_structure():
     print("\n🧪 TEST 2: Hierarchical Structure")
     print("=" * 60)
 
-    with open("/tmp/small_test.json") as f:
-        output = json.load(f)
+    output = get_output()
 
     tree = output["codebase_tree"]
 
@@ -78,8 +99,7 @@ def test_rich_edges():
     print("\n🧪 TEST 3: Rich Integration Edges")
     print("=" * 60)
 
-    with open("/tmp/small_test.json") as f:
-        output = json.load(f)
+    output = get_output()
 
     # Count edges by type
     edges_by_type = {
@@ -105,8 +125,7 @@ def test_crossroads_detection():
     print("\n🧪 TEST 4: Crossroads Detection")
     print("=" * 60)
 
-    with open("/tmp/small_test.json") as f:
-        output = json.load(f)
+    output = get_output()
 
     crossroads = output["global_integration_map"]["crossroads"]
     print(f"✅ Crossroads identified: {len(crossroads)}")
@@ -125,8 +144,7 @@ def test_critical_paths():
     print("\n🧪 TEST 5: Critical Paths")
     print("=" * 60)
 
-    with open("/tmp/small_test.json") as f:
-        output = json.load(f)
+    output = get_output()
 
     paths = output["global_integration_map"]["critical_paths"]
     print(f"✅ Critical paths identified: {len(paths)}")
@@ -160,13 +178,21 @@ def test_cli_help():
     print("\n🧪 TEST 7: CLI Interface")
     print("=" * 60)
 
-    result = subprocess.run(
-        [sys.executable, "integration_mapper.py", "--help"],
-        capture_output=True,
-        text=True
-    )
-
-    if result.returncode == 0 and "--root" in result.stdout:
+    # argparse raises SystemExit(0) after printing help; run in-process
+    # with patched argv instead of spawning an interpreter
+    help_text = io.StringIO()
+    argv = sys.argv
+    sys.argv = ["integration_mapper.py", "--help"]
+    try:
+        with contextlib.redirect_stdout(help_text):
+            mapper_main()
+        exit_code = 0
+    except SystemExit as e:
+        exit_code = e.code or 0
+    finally:
+        sys.argv = argv
+
+    if exit_code == 0 and "--root" in help_text.getvalue():
         print(f"✅ CLI help displays correctly")
         print(f"✅ All required arguments documented")
         return True
@@ -180,22 +206,36 @@ def test_exclude_patterns():
     print("\n🧪 TEST 8: Exclude Patterns")
     print("=" * 60)
 
-    result = subprocess.run(
-        [sys.executable, "integration_mapper.py", "--root", "/tmp/test_project",
-         "--output", "/tmp/exclude_test.json", "--exclude", "*/__init__.py"],
-        capture_output=True,
-        text=True
-    )
-
-    if result.returncode == 0:
-        with open("/tmp/exclude_test.json") as f:
-            output = json.load(f)
-        print(f"✅ Exclude patterns work")
-        print(f"✅ Files analyzed: {output['metadata']['files_analyzed']}")
-        return True
-    else:
-        print(f"❌ Exclude patterns failed")
-        return False
+    output = run_mapper("/tmp/test_project", "/tmp/exclude_test.json",
+                        exclude=["*/__init__.py"])
+
+    print(f"✅ Exclude patterns work")
+    print(f"✅ Files analyzed: {output['metadata']['files_analyzed']}")
+    return True
+
+
+def test_in_memory_sources():
+    """Test analysis of in-memory sources (no filesystem)."""
+    print("\n🧪 TEST 9: In-Memory Sources")
+    print("=" * 60)
+
+    sources = {
+        "pkg/models.py": "class User:\n    def save(self):\n        print('saved')\n",
+        "pkg/views.py": "from pkg.models import User\n\ndef index():\n    User().save()\n",
+    }
+    mapper = IntegrationMapper.from_sources(sources)
+    output = mapper.run()
+
+    metadata = output["metadata"]
+    assert metadata["files_analyzed"] == 2, f"Expected 2 files, got {metadata['files_analyzed']}"
+    assert metadata["components_found"] > 0, "No components found"
+    assert metadata["total_integration_points"] > 0, "No integration points"
+
+    print(f"✅ Analyzed {metadata['files_analyzed']} in-memory sources")
+    print(f"✅ Components: {metadata['components_found']}")
+    print(f"✅ Integration points: {metadata['total_integration_points']}")
+
+    return True
 
 
 def main():
@@ -213,6 +253,7 @@ def main():
         ("JSON Validity", test_json_validity),
         ("CLI Interface", test_cli_help),
         ("Exclude Patterns", test_exclude_patterns),
+        ("In-Memory Sources", test_in_memory_sources),
     ]
 
     results = []